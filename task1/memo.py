@@ -0,0 +1,118 @@
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, NamedTuple
+
+# Позначка відсутнього значення (щоб у кеші можна було зберігати і None)
+_MISSING = object()
+
+class CacheStats(NamedTuple):
+    '''Знімок лічильників кешу'''
+    hits: int       # Кількість влучань
+    misses: int     # Кількість промахів
+    evictions: int  # Кількість витіснених записів
+    size: int       # Поточна кількість записів
+    nbytes: int     # Приблизний обсяг значень у байтах
+
+class MemoCache:
+    '''
+    Потокобезпечний LRU-кеш з обмеженням за кількістю записів (`maxsize`)
+    та/або за сумарним розміром значень у байтах (`maxbytes`).
+    `None` для обмеження означає його відсутність.
+    '''
+
+    def __init__(self, maxsize: int | None = 128, maxbytes: int | None = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize не може бути від'ємним")
+        if maxbytes is not None and maxbytes < 0:
+            raise ValueError("maxbytes не може бути від'ємним")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        '''Повертає значення за ключем і позначає його як нещодавно використане'''
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        '''Додає значення і витісняє найстаріші записи, якщо перевищено обмеження'''
+        nbytes = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            # Значення, яке само по собі більше за ліміт, не кешуємо
+            if (self.maxsize == 0) or (self.maxbytes is not None and nbytes > self.maxbytes):
+                return
+            self._data[key] = (value, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def _evict(self) -> None:
+        # Викликається лише під блокуванням
+        while self._data and (
+            (self.maxsize is not None and len(self._data) > self.maxsize)
+            or (self.maxbytes is not None and self._nbytes > self.maxbytes)
+        ):
+            _, (_, nbytes) = self._data.popitem(last=False)
+            self._nbytes -= nbytes
+            self._evictions += 1
+
+    def clear(self) -> None:
+        '''Очищує кеш і скидає лічильники'''
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        '''Повертає поточні лічильники кешу'''
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._data), self._nbytes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+def memoize(maxsize: int | None = 128, maxbytes: int | None = None,
+            cache: MemoCache | None = None):
+    '''
+    Декоратор мемоізації на основі `MemoCache`.
+    Ключем є позиційні та іменовані аргументи виклику.
+    Обгорнута функція отримує атрибути `cache`, `cache_stats()` та `cache_clear()`.
+    '''
+    def decorator(func):
+        memo = cache if cache is not None else MemoCache(maxsize, maxbytes)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            result = memo.get(key, _MISSING)
+            if result is _MISSING:
+                # Обчислення відбувається поза блокуванням, щоб не гальмувати інші потоки
+                result = func(*args, **kwargs)
+                memo.put(key, result)
+            return result
+
+        wrapper.cache = memo
+        wrapper.cache_stats = memo.stats
+        wrapper.cache_clear = memo.clear
+        return wrapper
+    return decorator
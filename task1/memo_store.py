@@ -0,0 +1,196 @@
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl  # Блокування файлу між процесами (Unix)
+except ImportError:
+    fcntl = None
+    import msvcrt  # Windows
+
+# Формат файлу: заголовок (сигнатура + версія + покоління), далі записи, що лише дописуються в кінець.
+# Покоління збільшується при кожному invalidate(), щоб інші відкриті сховища помітили очищення.
+# Запис: три довжини (n, mod, значення) у форматі uint32 і самі числа у little-endian байтах.
+# Відсутній модуль кодується довжиною 0.
+_MAGIC = b'FIBM'
+_VERSION = 2
+_HEADER = struct.Struct('<4sBI')
+_RECORD = struct.Struct('<III')
+
+def _int_to_bytes(x: int) -> bytes:
+    return x.to_bytes((x.bit_length() + 7) // 8 or 1, 'little')
+
+def _int_from_bytes(b) -> int:
+    return int.from_bytes(b, 'little')
+
+class DiskMemoStore:
+    '''
+    Постійне сховище результатів `fibonacci` у компактному бінарному файлі.
+    Під час відкриття зчитуються лише заголовки записів (індекс ключ → зсув),
+    а самі значення декодуються з mmap лише за запитом.
+    `max_bytes` обмежує розмір файлу: після досягнення ліміту нові записи не додаються.
+    Один файл можуть одночасно використовувати кілька сховищ і процесів: кожна операція
+    виконується під блокуванням файлу (спільним для читання, винятковим для запису)
+    і спершу дочитує записи, додані іншими, тож дописування завжди йде в справжній кінець файлу.
+    '''
+
+    def __init__(self, path: str, max_bytes: int | None = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: dict[tuple[int, int | None], tuple[int, int]] = {}
+        self._mm: mmap.mmap | None = None
+        self._file = None
+        self._size = 0
+        self._generation = None
+        self._open()
+
+    def _open(self) -> None:
+        # Без буферизації: інакше читання могло б повернути застарілі дані, дописані іншим процесом
+        self._file = open(self.path, 'r+b' if os.path.exists(self.path) else 'w+b', buffering=0)
+        with self._locked(exclusive=True):
+            self._refresh(exclusive=True)
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        '''Блокування між потоками цього сховища і між усіма, хто відкрив той самий файл'''
+        with self._lock:
+            fd = self._file.fileno()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                # msvcrt блокує байти від поточної позиції і не має спільного режиму
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def _refresh(self, exclusive: bool) -> None:
+        '''
+        Звіряє індекс зі станом файлу: дочитує нові записи інших сховищ, а після
+        чужого invalidate() (інше покоління або коротший файл) будує індекс наново.
+        '''
+        self._file.seek(0)
+        header = self._file.read(_HEADER.size)
+        if len(header) < _HEADER.size or _HEADER.unpack(header)[:2] != (_MAGIC, _VERSION):
+            if exclusive:
+                # Новий, пошкоджений або застарілий файл — починаємо з чистого сховища
+                self._reset(generation=0)
+            else:
+                self._index.clear()  # Читачеві — порожнє сховище; файл перепише наступний запис
+                self._generation = None
+            return
+        generation = _HEADER.unpack(header)[2]
+        file_size = os.fstat(self._file.fileno()).st_size
+        if generation != self._generation or file_size < self._size:
+            self._index.clear()
+            self._generation = generation
+            self._size = _HEADER.size
+        # Решта рішень — лише за розміром проіндексованої частини, не за довжиною mmap:
+        # після чужого invalidate() файл міг знову заповнитися до того самого розміру
+        if self._size < file_size:
+            self._size = self._scan(self._size, file_size, truncate=exclusive)
+        elif self._mm is None or len(self._mm) < self._size:
+            self._remap(self._size)  # Власні дописані записи ще не відображені в пам'ять
+
+    def _reset(self, generation: int) -> None:
+        self._close_map()
+        self._index.clear()
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, generation))
+        self._generation = generation
+        self._size = _HEADER.size
+        self._remap(self._size)
+
+    def _scan(self, pos: int, file_size: int, truncate: bool) -> int:
+        '''
+        Додає до індексу записи з `pos` до кінця файлу. Обірваний останній запис
+        (збій посеред дописування) відкидається, а з `truncate` — ще й відрізається від файлу.
+        '''
+        self._remap(file_size)
+        while pos + _RECORD.size <= file_size:
+            n_len, mod_len, val_len = _RECORD.unpack_from(self._mm, pos)
+            end = pos + _RECORD.size + n_len + mod_len + val_len
+            if end > file_size:
+                break
+            start = pos + _RECORD.size
+            n = _int_from_bytes(self._mm[start:start + n_len])
+            mod = _int_from_bytes(self._mm[start + n_len:start + n_len + mod_len]) if mod_len else None
+            self._index[(n, mod)] = (start + n_len + mod_len, val_len)
+            pos = end
+        if pos != file_size and truncate:
+            self._close_map()
+            self._file.truncate(pos)
+            self._remap(pos)
+        return pos
+
+    def _remap(self, size: int) -> None:
+        self._close_map()
+        self._mm = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _close_map(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def get(self, n: int, mod: int | None = None) -> int | None:
+        '''Повертає збережене значення F(n) (за модулем `mod`) або None'''
+        with self._locked(exclusive=False):
+            self._refresh(exclusive=False)
+            loc = self._index.get((n, mod))
+            if loc is None:
+                return None
+            offset, length = loc
+            return _int_from_bytes(self._mm[offset:offset + length])
+
+    def put(self, n: int, mod: int | None, value: int) -> bool:
+        '''Дописує значення у файл. Повертає False, якщо запис не вміщується в ліміт'''
+        n_b = _int_to_bytes(n)
+        mod_b = _int_to_bytes(mod) if mod is not None else b''
+        val_b = _int_to_bytes(value)
+        record = _RECORD.pack(len(n_b), len(mod_b), len(val_b)) + n_b + mod_b + val_b
+        with self._locked(exclusive=True):
+            self._refresh(exclusive=True)  # Тепер self._size — справжній кінець файлу
+            if (n, mod) in self._index:
+                return True
+            if self.max_bytes is not None and self._size + len(record) > self.max_bytes:
+                return False
+            self._file.seek(self._size)
+            self._file.write(record)
+            self._index[(n, mod)] = (self._size + _RECORD.size + len(n_b) + len(mod_b), len(val_b))
+            self._size += len(record)
+            return True
+
+    def invalidate(self) -> None:
+        '''Видаляє всі збережені значення (і для інших сховищ, відкритих на цьому файлі)'''
+        with self._locked(exclusive=True):
+            self._refresh(exclusive=True)
+            self._reset(self._generation + 1)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_map()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __contains__(self, key: tuple[int, int | None]) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
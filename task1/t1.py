@@ -1,24 +1,151 @@
-print("\033[H\033[J", end='')  # Переміщує курсор у верхній лівий кут і очищує екран
+from typing import Generator, Iterable
+from memo import memoize
+from memo_store import DiskMemoStore
 
-def caching_fibonacci():
-    cache = {}
+try:
+    import numpy as np  # Необов'язкова залежність для векторизованих обчислень за модулем
+except ImportError:
+    np = None
 
-    def fibonacci(n:int):
+# Найбільший модуль, за якого добутки в int64 гарантовано не переповнюються
+_NUMPY_MAX_MOD = 1 << 31
+# Мінімальний розмір пакета, з якого вигідно переходити на NumPy
+_NUMPY_MIN_BATCH = 1024
+
+def _fib_pair(n: int, mod: int | None = None) -> tuple[int, int]:
+    '''
+    Повертає пару (F(n), F(n+1)) методом швидкого подвоєння (fast doubling).
+    Ітеративно проходить по бітах `n` від старшого до молодшого, тож рекурсії немає,
+    а кількість кроків — O(log n). Якщо задано `mod`, усі обчислення ведуться за модулем.
+    '''
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        # F(2k) = F(k) * (2*F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        if mod is not None:
+            c %= mod
+            d %= mod
+        if bit == '1':
+            a, b = d, c + d
+            if mod is not None:
+                b %= mod
+        else:
+            a, b = c, d
+    return a, b
+
+def fib_range(a: int, b: int, mod: int | None = None) -> Generator[int, None, None]:
+    '''
+    Генерує F(a), F(a+1), ..., F(b) включно.
+    Початкова пара рахується швидким подвоєнням, далі кожен член — одне додавання.
+    '''
+    if mod is not None and mod <= 0:
+        raise ValueError("Модуль має бути додатним числом")
+    x, y = _fib_pair(max(a, 0), mod)
+    for n in range(a, b + 1):
+        if n < 0:
+            yield 0
+            continue
+        yield x
+        x, y = y, x + y
+        if mod is not None and y >= mod:
+            y -= mod
+
+def _fib_many_numpy(indices, mod: int):
+    '''Векторизоване швидке подвоєння за модулем для масиву індексів (потрібен NumPy)'''
+    n = np.maximum(np.asarray(indices, dtype=np.int64), 0)
+    a = np.zeros(n.shape, dtype=np.int64)
+    b = np.ones(n.shape, dtype=np.int64) % mod
+    top = int(n.max()).bit_length() if n.size else 0
+    # Провідні нульові біти не змінюють пару (0, 1), тож усі індекси обробляються разом
+    for shift in range(top - 1, -1, -1):
+        c = (a * ((2 * b - a) % mod)) % mod
+        d = (a * a + b * b) % mod
+        odd = ((n >> shift) & 1).astype(bool)
+        a = np.where(odd, d, c)
+        b = np.where(odd, (c + d) % mod, d)
+    return a
+
+def fib_many(indices: Iterable[int], mod: int | None = None) -> list[int]:
+    '''
+    Обчислює F(n) для кожного індексу зі спільною роботою між ними.
+    Індекси сортуються; наступне значення виводиться з попередньої пари за формулою додавання
+    F(k+d) = F(k)·F(d-1) + F(k+1)·F(d), тож подвоєння йде лише по різниці d.
+    Для великих пакетів за модулем < 2^31 використовується NumPy, якщо він встановлений.
+    Результат повертається у порядку вхідних індексів.
+    '''
+    if mod is not None and mod <= 0:
+        raise ValueError("Модуль має бути додатним числом")
+    indices = list(indices)
+    if (np is not None and mod is not None and mod <= _NUMPY_MAX_MOD
+            and len(indices) >= _NUMPY_MIN_BATCH):
+        return [int(v) for v in _fib_many_numpy(indices, mod)]
+
+    results: dict[int, int] = {}
+    k, x, y = 0, 0, 1 % mod if mod is not None else 1  # Поточна пара (F(k), F(k+1))
+    for n in sorted(set(indices)):
+        if n <= 0:
+            results[n] = 0
+            continue
+        d = n - k
+        if d <= 64:
+            # Маленькі кроки дешевше пройти додаваннями
+            for _ in range(d):
+                x, y = y, x + y
+                if mod is not None:
+                    y %= mod
+        else:
+            fd, fd1 = _fib_pair(d, mod)
+            fd_1 = fd1 - fd  # F(d-1)
+            x, y = x * fd_1 + y * fd, x * fd + y * fd1
+            if mod is not None:
+                x %= mod
+                y %= mod
+        k = n
+        results[n] = x
+    return [results[n] for n in indices]
+
+def caching_fibonacci(maxsize: int | None = 128, maxbytes: int | None = None,
+                      store: DiskMemoStore | None = None):
+    '''
+    Повертає функцію `fibonacci(n, mod=None)` з власним обмеженим LRU-кешем результатів.
+    Статистика кешу доступна через `fibonacci.cache_stats()`.
+    Якщо передано `store`, результати додатково зберігаються на диску між запусками.
+    '''
+    @memoize(maxsize, maxbytes)
+    def cached(n: int, mod: int | None):
+        if store is not None:
+            value = store.get(n, mod)
+            if value is not None:
+                return value
+        value = _fib_pair(n, mod)[0]
+        if store is not None:
+            store.put(n, mod, value)
+        return value
+
+    def fibonacci(n: int, mod: int | None = None):
+        if mod is not None and mod <= 0:
+            raise ValueError("Модуль має бути додатним числом")
         if n <= 0:
             return 0
         elif n == 1:
-            return 1
-        elif n in cache:
-            return cache[n]
+            return 1 % mod if mod is not None else 1
 
-        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
-        return cache[n]
+        # Кешуємо лише кінцеві результати, без проміжних значень
+        return cached(n, mod)
 
+    fibonacci.cache = cached.cache
+    fibonacci.cache_stats = cached.cache_stats
+    fibonacci.cache_clear = cached.cache_clear
+    fibonacci.store = store
     return fibonacci
 
-# Отримуємо функцію fibonacci
-fib = caching_fibonacci()
+if __name__ == "__main__":
+    print("\033[H\033[J", end='')  # Переміщує курсор у верхній лівий кут і очищує екран
+
+    # Отримуємо функцію fibonacci
+    fib = caching_fibonacci()
 
-# Використовуємо функцію fibonacci для обчислення чисел Фібоначчі
-print(fib(10))  # Виведе 55
-print(fib(15))  # Виведе 610
\ No newline at end of file
+    # Використовуємо функцію fibonacci для обчислення чисел Фібоначчі
+    print(fib(10))  # Виведе 55
+    print(fib(15))  # Виведе 610
@@ -0,0 +1,111 @@
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+import scan
+import t2
+
+# Розміри вхідних даних (МіБ) і щільність чисел (частка токенів, що є числами)
+SIZES_MB = (1.0, 8.0, 32.0)
+DENSITIES = (0.05, 0.3, 0.9)
+WORDS = ("дохід", "income", "за", "місяць", "премія", "bonus", "і", "доларів", "—", "total")
+
+def make_text(size_mb: float, density: float, seed: int = 42) -> str:
+    '''Генерує детермінований текст заданого розміру з вказаною щільністю чисел'''
+    rnd = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts, size = [], 0
+    while size < target:
+        if rnd.random() < density:
+            token = f"{rnd.randrange(10 ** rnd.randrange(1, 8))}.{rnd.randrange(100):02d}"
+        else:
+            token = rnd.choice(WORDS)
+        parts.append(token)
+        size += len(token.encode()) + 1
+    return " ".join(parts)
+
+def regex_str(text: str, data: bytes) -> float:
+    return t2.sum_profit(text, t2.generator_numbers)
+
+def regex_bytes(text: str, data: bytes) -> float:
+    return sum(float(m.group()) for m in re.finditer(rb"\d+\.\d+", data))
+
+def scanner(text: str, data: bytes) -> float:
+    return scan.sum_buffer(data)
+
+CASES = {"regex-str": regex_str, "regex-bytes": regex_bytes, "scanner": scanner}
+
+def measure(func, text: str, data: bytes, repeat: int) -> dict:
+    '''
+    Найкращий час з `repeat` запусків і окремий прогін під tracemalloc.
+    Вимірюється лише пік одночасно зайнятої пам'яті (get_traced_memory), а не кількість алокацій:
+    тимчасові об'єкти, що звільняються одразу, на пік майже не впливають.
+    '''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text, data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(text, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"result": result, "seconds": best, "mb_s": len(data) / 1024 / 1024 / best, "peak_kib": peak / 1024}
+
+def run(sizes, densities, repeat: int) -> list[dict]:
+    rows = []
+    for size in sizes:
+        for density in densities:
+            text = make_text(size, density)
+            data = text.encode()
+            reference = None
+            for name, func in CASES.items():
+                row = {"case": name, "size_mb": size, "density": density, **measure(func, text, data, repeat)}
+                # Усі реалізації мають давати однаковий результат
+                if reference is None:
+                    reference = row["result"]
+                row["ok"] = row["result"] == reference
+                rows.append(row)
+    return rows
+
+def print_table(rows: list[dict], baseline: dict | None = None):
+    print(f"{'Випадок':<12} {'МіБ':>5} {'Щільн.':>7} {'МБ/с':>9} {'Пік пам., КіБ':>18}  OK  Δ до базового")
+    for row in rows:
+        delta = ""
+        if baseline:
+            base = baseline.get(f"{row['case']}/{row['size_mb']}/{row['density']}")
+            if base:
+                delta = f"{(row['mb_s'] / base - 1) * 100:+.1f}%"
+        print(f"{row['case']:<12} {row['size_mb']:>5} {row['density']:>7} {row['mb_s']:>9.1f} "
+              f"{row['peak_kib']:>18.1f}  {'✔' if row['ok'] else '✘'}  {delta}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пошуку чисел у task2")
+    parser.add_argument("--sizes", type=float, nargs="+", default=SIZES_MB, help="розміри вхідних даних, МіБ")
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES, help="щільність чисел 0..1")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="FILE", help="зберегти результати як базові (JSON)")
+    parser.add_argument("--baseline", metavar="FILE", help="порівняти з базовими результатами (JSON)")
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.densities, args.repeat)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_table(rows, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({f"{r['case']}/{r['size_mb']}/{r['density']}": r["mb_s"] for r in rows}, file, indent=2)
+    if not all(row["ok"] for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from typing import Generator
+import math
+import mmap
+import os
+import re
+
+# Байтовий варіант шаблону з t2.py. На відміну від `str`-версії, тут `\d` — лише ASCII-цифри 0-9
+NUMBER_BYTES_RE = re.compile(rb"\d+\.\d+")
+
+DEFAULT_WINDOW = 1 << 18  # 256 КіБ — розмір вікна, в межах якого шукаються числа
+_NUMBER_BYTES = frozenset(b"0123456789.")
+
+Buffer = bytes | bytearray | memoryview | mmap.mmap
+
+# finditer замість findall: збіги вікна не збираються в список, у пам'яті — лише поточний
+_group = re.Match.group
+
+def _windows(buffer: Buffer, window: int) -> Generator[memoryview, None, None]:
+    '''
+    Ділить буфер на вікна без копіювання (memoryview).
+    Межу вікна відсуваємо назад до байта, що не є цифрою чи крапкою, щоб не розрізати число.
+    '''
+    view = memoryview(buffer)
+    size = len(view)
+    start = 0
+    while start < size:
+        end = min(start + window, size)
+        if end < size:
+            cut = end
+            while cut > start and view[cut - 1] in _NUMBER_BYTES:
+                cut -= 1
+            # Якщо все вікно — одне число, беремо його цілком
+            if cut == start:
+                while end < size and view[end] in _NUMBER_BYTES:
+                    end += 1
+            else:
+                end = cut
+        yield view[start:end]
+        start = end
+
+def scan_numbers(buffer: Buffer, window: int = DEFAULT_WINDOW) -> Generator[float, None, None]:
+    '''
+    Знаходить числа безпосередньо у байтовому буфері (bytes, memoryview, mmap) без декодування в `str`.
+    '''
+    for chunk in _windows(buffer, window):
+        yield from map(float, map(_group, NUMBER_BYTES_RE.finditer(chunk)))
+
+def sum_buffer(buffer: Buffer, exact: bool = False, window: int = DEFAULT_WINDOW) -> float:
+    '''
+    Підсумовує числа в буфері без генератора і без списків збігів чи float-ів:
+    `map(float, ...)` споживається напряму функцією `sum`, а між вікнами передається лише поточна сума,
+    тож порядок додавання (і результат) такий самий, як у `sum(generator_numbers(text))`.
+    `exact=True` рахує через `math.fsum`.
+    '''
+    if exact:
+        return math.fsum(scan_numbers(buffer, window))
+    total = 0.0
+    for chunk in _windows(buffer, window):
+        total = sum(map(float, map(_group, NUMBER_BYTES_RE.finditer(chunk))), total)
+    return total
+
+def sum_file(path: str | os.PathLike, exact: bool = False, window: int = DEFAULT_WINDOW) -> float:
+    '''Підсумовує числа у файлі, читаючи його через mmap без декодування'''
+    if os.path.getsize(path) == 0:
+        return 0.0
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return sum_buffer(mm, exact, window)
@@ -1,18 +1,211 @@
-from typing import Callable, Generator
+from typing import BinaryIO, Callable, Generator, TextIO
+from concurrent.futures import ProcessPoolExecutor
+from decimal import MAX_PREC, Decimal, Inexact, localcontext
+from itertools import chain
+from operator import neg
+import codecs
+import math
+import os
 import re
 
-print("\033[H\033[J", end='')  # Переміщує курсор у верхній лівий кут і очищує екран
+NUMBER_RE = re.compile(r"\d+\.\d+")
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 МіБ
+_NUMBER_BYTES = frozenset(b"0123456789.")
 
 def generator_numbers(text: str):
-    for num in re.findall(r"\d+\.\d+", text):
-        yield float(num)  # Повертаємо кожне знайдене число по черзі
+    for match in NUMBER_RE.finditer(text):
+        yield float(match.group())  # Повертаємо кожне знайдене число по черзі
+
+def _safe_cut(buffer: str) -> int:
+    '''
+    Повертає позицію, після якої в кінці буфера йдуть лише цифри та крапки.
+    Межа, що не проходить по таких символах, не розриває жодного збігу `NUMBER_RE`.
+    '''
+    cut = len(buffer)
+    while cut and (buffer[cut - 1] == "." or buffer[cut - 1].isdecimal()):
+        cut -= 1
+    return cut
+
+def _read_chunks(source: str | os.PathLike | TextIO | BinaryIO, chunk_size: int,
+                 encoding: str) -> Generator[str, None, None]:
+    '''Читає джерело шматками фіксованого розміру і повертає їх як рядки'''
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding=encoding) as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+        return
+
+    # Бінарні потоки (файли, socket.makefile('rb')) декодуються інкрементально,
+    # щоб багатобайтовий символ на межі чанка не ламав декодування
+    decoder = None
+    while chunk := source.read(chunk_size):
+        if isinstance(chunk, str):
+            yield chunk
+            continue
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        yield decoder.decode(chunk)
+    if decoder is not None and (tail := decoder.decode(b"", final=True)):
+        yield tail
+
+def _number_string_chunks(source: str | os.PathLike | TextIO | BinaryIO, chunk_size: int,
+                          encoding: str) -> Generator[list[str], None, None]:
+    '''Повертає тексти знайдених чисел списками — по одному на прочитаний шматок джерела'''
+    carry = ""
+    for chunk in _read_chunks(source, chunk_size, encoding):
+        buffer = carry + chunk
+        cut = _safe_cut(buffer)
+        carry = buffer[cut:]
+        yield NUMBER_RE.findall(buffer, 0, cut)
+    yield NUMBER_RE.findall(carry)
+
+def _number_strings_stream(source: str | os.PathLike | TextIO | BinaryIO, chunk_size: int,
+                           encoding: str) -> Generator[str, None, None]:
+    '''Повертає текст кожного знайденого числа, читаючи джерело шматками'''
+    carry = ""
+    for chunk in _read_chunks(source, chunk_size, encoding):
+        buffer = carry + chunk
+        cut = _safe_cut(buffer)
+        carry = buffer[cut:]
+        for match in NUMBER_RE.finditer(buffer, 0, cut):
+            yield match.group()
+    for match in NUMBER_RE.finditer(carry):
+        yield match.group()
+
+def generator_numbers_stream(source: str | os.PathLike | TextIO | BinaryIO,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             encoding: str = "utf-8") -> Generator[float, None, None]:
+    '''
+    Потоковий варіант `generator_numbers` для великих файлів і потоків.
+    Приймає шлях до файлу, текстовий або бінарний потік і читає його шматками по `chunk_size`.
+    Хвіст чанка, що складається лише з цифр і крапок, переноситься в наступний чанк,
+    тому числа на межі не розриваються, а пам'ять не залежить від розміру вхідних даних.
+    '''
+    for num in _number_strings_stream(source, chunk_size, encoding):
+        yield float(num)
+
+class _RangeReader:
+    '''Бінарний потік, обмежений діапазоном байтів [start, end) файлу'''
+
+    def __init__(self, file: BinaryIO, start: int, end: int):
+        file.seek(start)
+        self._file = file
+        self._left = end - start
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._left:
+            size = self._left
+        data = self._file.read(size)
+        self._left -= len(data)
+        return data
+
+def _exact_expansion(values: list[float]) -> list[float]:
+    '''
+    Кілька float-ів, точна сума яких дорівнює точній сумі `values`.
+    Кожен прохід `math.fsum` дає коректно округлену суму ще не врахованого залишку;
+    залишок зменшується щонайменше в 2**52 раз, тож зазвичай вистачає 2–3 проходів.
+    '''
+    parts: list[float] = []
+    while True:
+        part = math.fsum(chain(values, map(neg, parts)))
+        if not math.isfinite(part):
+            return [part]  # inf/nan лише поширюємо далі
+        if not part:
+            return parts
+        parts.append(part)
+
+def _exact_partial_sum(path: str | os.PathLike, start: int, end: int, accumulator: str,
+                       chunk_size: int, encoding: str) -> list[float] | Decimal:
+    '''
+    Точна сума чисел у діапазоні файлу (виконується у процесі пулу) без округлення,
+    тож часткові суми можна зливати в будь-якому порядку.
+    Для `fsum` — кілька float-ів, що разом точно дорівнюють сумі (`_exact_expansion`
+    по кожному прочитаному шматку), без Decimal на кожне число; для `decimal` — Decimal
+    із тексту чисел.
+    '''
+    with open(path, "rb") as file:
+        chunks = _number_string_chunks(_RangeReader(file, start, end), chunk_size, encoding)
+        if accumulator == "fsum":
+            parts: list[float] = []
+            for strings in chunks:
+                values = list(map(float, strings))
+                values.extend(parts)
+                parts = _exact_expansion(values)
+            return parts
+        with localcontext() as ctx:
+            ctx.prec = MAX_PREC
+            ctx.traps[Inexact] = True  # Гарантія, що жодне додавання не округлюється
+            total = Decimal(0)
+            for strings in chunks:
+                total = sum(map(Decimal, strings), total)
+            return total
+
+def _split_points(path: str | os.PathLike, parts: int) -> list[int]:
+    '''
+    Ділить файл на `parts` діапазонів. Кожну межу зсуваємо вперед до ASCII-символу,
+    що не є цифрою чи крапкою — так межа не потрапляє всередину числа чи UTF-8 символу.
+    '''
+    size = os.path.getsize(path)
+    points = [0]
+    with open(path, "rb") as file:
+        for i in range(1, parts):
+            pos = max(size * i // parts, points[-1])
+            file.seek(pos)
+            while pos < size:
+                block = file.read(4096)
+                if not block:
+                    break
+                for byte in block:
+                    if byte < 0x80 and byte not in _NUMBER_BYTES:
+                        break
+                    pos += 1
+                else:
+                    continue
+                break
+            points.append(min(pos, size))
+    points.append(size)
+    return points
+
+def sum_profit_parallel(path: str | os.PathLike, jobs: int | None = None, accumulator: str = "fsum",
+                        chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8") -> float | Decimal:
+    '''
+    Точно підсумовує всі числа у файлі, розподіляючи роботу між `jobs` процесами.
+    `accumulator="fsum"` повертає float, що збігається з `math.fsum` по всіх числах файлу;
+    `accumulator="decimal"` повертає точну десяткову суму як Decimal.
+    Результат не залежить від кількості процесів.
+    '''
+    if accumulator not in ("fsum", "decimal"):
+        raise ValueError("accumulator має бути 'fsum' або 'decimal'")
+    jobs = jobs or os.cpu_count() or 1
+    # Немає сенсу ділити файл на шматки, менші за чанк читання
+    jobs = max(1, min(jobs, os.path.getsize(path) // chunk_size))
+    points = _split_points(path, jobs)
+    ranges = [(path, start, end, accumulator, chunk_size, encoding)
+              for start, end in zip(points, points[1:]) if end > start]
+
+    if jobs == 1:
+        partials = [_exact_partial_sum(*args) for args in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            partials = list(pool.map(_exact_partial_sum, *zip(*ranges)))
+
+    if accumulator == "fsum":
+        # Сума всіх часткових розкладів точно дорівнює сумі чисел, а fsum округлює коректно —
+        # тож результат дорівнює math.fsum по всіх числах файлу
+        return math.fsum(chain.from_iterable(partials))
+    with localcontext() as ctx:
+        ctx.prec = MAX_PREC
+        return sum(partials, Decimal(0))
 
 def sum_profit(text: str, func: Callable[[str], Generator[float, None, None]]) -> float:
     return sum(func(text))
 
+if __name__ == "__main__":
+    print("\033[H\033[J", end='')  # Переміщує курсор у верхній лівий кут і очищує екран
 
-text = "Загальний дохід працівника складається з декількох частин: 1000.01 як основний дохід, доповнений додатковими надходженнями 27.45 і 324.00 доларів."
-gen = generator_numbers(text)
+    text = "Загальний дохід працівника складається з декількох частин: 1000.01 як основний дохід, доповнений додатковими надходженнями 27.45 і 324.00 доларів."
+    gen = generator_numbers(text)
 
-total_income = sum_profit(text, generator_numbers)
-print(f"Загальний дохід: {total_income}")
\ No newline at end of file
+    total_income = sum_profit(text, generator_numbers)
+    print(f"Загальний дохід: {total_income}")
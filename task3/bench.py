@@ -0,0 +1,174 @@
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import loggen
+import t3
+from logstore import LogStore
+
+try:
+    import resource  # Пік RSS процесу (немає у Windows)
+except ImportError:
+    resource = None
+
+LINES = (1_000_000,)
+INVALID_RATE = 0.01
+COMPRESSORS = {
+    "plain": lambda src, dst: shutil.copyfileobj(src, dst),
+    "gzip":  lambda src, dst: _compress(src, gzip.GzipFile(fileobj=dst, mode="wb")),
+    "bz2":   lambda src, dst: _compress(src, bz2.BZ2File(dst, "wb")),
+    "xz":    lambda src, dst: _compress(src, lzma.LZMAFile(dst, "wb")),
+}
+
+def _compress(src, stream):
+    with stream:
+        shutil.copyfileobj(src, stream, 1 << 20)
+
+def peak_rss_mib() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  # macOS — байти, Linux — КіБ
+
+# ---- Етапи конвеєра t3 ----
+# Кожен етап отримує результат попереднього; "store" і "stream" — окремі шляхи від файлу
+
+def stage_load(path, _):
+    return t3.load_logs(path)
+
+def stage_parse(_, lines):
+    return dict(enumerate(t3.parse_logs(lines)))
+
+def stage_count(_, logs):
+    t3.count_logs_by_level(logs)
+    return logs
+
+def stage_format(_, logs):
+    t3.format_logs_with_colors(logs)
+    return None
+
+def stage_store(path, _):
+    return LogStore.from_file(path, list(t3.LogLevel)).counts()
+
+def stage_stream(path, _):
+    counts, incorrect_count, _ = t3.analyze_logs(t3.parse_logs(t3.read_log_lines(path)))
+    return counts, incorrect_count
+
+STAGES = {"load": stage_load, "parse": stage_parse, "count": stage_count, "format": stage_format,
+          "store": stage_store, "stream": stage_stream}
+
+def run_stages(path: str, stages, trace: bool) -> list[dict]:
+    '''
+    Проганяє етапи по черзі в цьому процесі: спершу для часу і піку RSS,
+    потім (з `trace`) ще раз під tracemalloc для піку алокацій кожного етапу.
+    '''
+    rows, result = [], None
+    for name in stages:
+        start, cpu = time.perf_counter(), time.process_time()
+        result = STAGES[name](path, result)
+        rows.append({"stage": name, "seconds": time.perf_counter() - start,
+                     "cpu": time.process_time() - cpu, "rss_mib": peak_rss_mib()})
+        if name in ("store", "stream"):
+            rows[-1]["result"] = result  # Статистика для звірки між форматами
+    if trace:
+        result = None
+        tracemalloc.start()
+        for row in rows:
+            tracemalloc.reset_peak()
+            result = STAGES[row["stage"]](path, result)
+            row["peak_mib"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return rows
+
+def run(lines_list, stages, formats, trace: bool, invalid_rate: float, seed: int) -> list[dict]:
+    rows = []
+    if any(fmt != "plain" for fmt in formats):
+        # Для звірки стиснених форматів потрібні ті самі етапи на звичайному файлі
+        stages = list(stages) + [stage for stage in ("stream", "store") if stage not in stages]
+    with tempfile.TemporaryDirectory() as tmp:
+        for lines in lines_list:
+            path = os.path.join(tmp, "bench.log")
+            size = loggen.write_log(path, lines, invalid_rate=invalid_rate, seed=seed)
+            # Кожен прогін — у свіжому процесі, щоб пік RSS не накопичувався між прогонами
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                for row in pool.submit(run_stages, path, stages, trace).result():
+                    rows.append({**row, "lines": lines, "format": "plain", "size": size})
+            for fmt in formats:
+                if fmt == "plain":
+                    continue
+                packed = f"{path}.{fmt}"
+                with open(path, "rb") as src, open(packed, "wb") as dst:
+                    COMPRESSORS[fmt](src, dst)
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    for row in pool.submit(run_stages, packed, ["stream", "store"], trace).result():
+                        rows.append({**row, "lines": lines, "format": fmt, "size": size,
+                                     "ratio": size / os.path.getsize(packed)})
+                os.remove(packed)
+    reference = {(row["stage"], row["lines"]): row["result"]
+                 for row in rows if row["format"] == "plain" and "result" in row}
+    for row in rows:
+        # Стиснений і звичайний файл мають давати однакову статистику
+        row["ok"] = "result" not in row or row["result"] == reference.get((row["stage"], row["lines"]))
+        row["lines_s"] = row["lines"] / row["seconds"]
+        row["mb_s"] = row["size"] / 1024 / 1024 / row["seconds"]
+    return rows
+
+def row_key(row: dict) -> str:
+    return f"{row['stage']}/{row['format']}/{row['lines']}"
+
+def print_table(rows: list[dict], baseline: dict | None = None):
+    print(f"{'Етап':<7} {'Формат':<6} {'Стиснення':>9} {'Рядків':>11} {'Рядків/с':>11} {'МБ/с':>8} {'CPU, с':>7} "
+          f"{'Пік RSS, МіБ':>13} {'Пік алокацій, МіБ':>18}  OK  Δ до базового")
+    for row in rows:
+        delta = ""
+        if baseline and (base := baseline.get(row_key(row))):
+            delta = f"{(row['lines_s'] / base - 1) * 100:+.1f}%"
+        rss = f"{row['rss_mib']:.1f}" if row["rss_mib"] is not None else "—"
+        peak = f"{row['peak_mib']:.1f}" if "peak_mib" in row else "—"
+        ratio = f"{row['ratio']:.1f}x" if "ratio" in row else ""
+        print(f"{row['stage']:<7} {row['format']:<6} {ratio:>9} {row['lines']:>11} {row['lines_s']:>11.0f} {row['mb_s']:>8.1f} "
+              f"{row['cpu']:>7.2f} {rss:>13} {peak:>18}  {'✔' if row['ok'] else '✘'}  {delta}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк конвеєра task3 на синтетичних логах")
+    parser.add_argument("--lines", type=int, nargs="+", default=LINES, help="кількість рядків згенерованого логу")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--formats", nargs="*", choices=COMPRESSORS, default=list(COMPRESSORS),
+                        help="формати стиснення для порівняння читання (етапи stream і store)")
+    parser.add_argument("--invalid", type=float, default=INVALID_RATE, help="частка некоректних рядків")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-trace", action="store_true", help="не вимірювати пік алокацій (tracemalloc)")
+    parser.add_argument("--save", metavar="FILE", help="зберегти результати як базові (JSON)")
+    parser.add_argument("--baseline", metavar="FILE", help="порівняти з базовими результатами (JSON)")
+    args = parser.parse_args()
+
+    # Етапи load → parse → count → format залежать один від одного
+    chain = ["load", "parse", "count", "format"]
+    stages = [stage for stage in STAGES if stage in args.stages]
+    needed = max((chain.index(stage) for stage in stages if stage in chain), default=-1)
+    stages = chain[:needed + 1] + [stage for stage in stages if stage not in chain]
+
+    rows = run(args.lines, stages, args.formats, not args.no_trace, args.invalid, args.seed)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_table(rows, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({row_key(row): row["lines_s"] for row in rows}, file, indent=2)
+    if not all(row["ok"] for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
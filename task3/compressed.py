@@ -0,0 +1,52 @@
+import bz2
+import gzip
+import io
+import lzma
+from typing import BinaryIO, TextIO
+
+# Формат стиснення визначається за сигнатурою на початку файлу, а не за розширенням
+MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2":  b"BZh",
+    "xz":   b"\xfd7zXZ\x00",
+}
+OPENERS = {"gzip": gzip.GzipFile, "bz2": bz2.BZ2File, "xz": lzma.LZMAFile}
+READ_BLOCK = 1 << 20  # Скільки розпакованих байтів читаємо за раз
+
+def detect_format(file_path: str) -> str | None:
+    '''Назва формату стиснення ("gzip", "bz2", "xz") або None для звичайного файлу'''
+    try:
+        with open(file_path, "rb") as file:
+            head = file.read(max(map(len, MAGIC.values())))
+    except OSError:
+        return None  # Помилку відкриття покаже основне читання файлу
+    for name, magic in MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+def open_binary(file_path: str) -> BinaryIO:
+    '''
+    Відкриває лог для читання байтів; стиснений файл розпаковується на льоту.
+    Розпаковувачі стандартної бібліотеки читають стиснені дані невеликими блоками
+    і віддають не більше запитаного, тож пам'ять обмежена розміром блоку, а не файлу.
+    Багатосегментні архіви (кілька gzip/bz2/xz потоків поспіль) читаються повністю.
+    '''
+    fmt = detect_format(file_path)
+    if fmt is None:
+        return open(file_path, "rb")
+    return OPENERS[fmt](file_path, "rb")
+
+def open_text(file_path: str) -> TextIO:
+    '''Те саме, що open(file_path, "r"), але й для стиснених файлів'''
+    if detect_format(file_path) is None:
+        return open(file_path, "r")
+    return io.TextIOWrapper(open_binary(file_path))
+
+def read_all(file_path: str, block: int = READ_BLOCK) -> bytearray:
+    '''Розпаковує файл у bytearray блоками по `block` байтів (для колонкового сховища)'''
+    buffer = bytearray()
+    with open_binary(file_path) as stream:
+        while chunk := stream.read(block):
+            buffer += chunk
+    return buffer
@@ -0,0 +1,83 @@
+import asyncio
+import os
+from typing import AsyncIterator
+
+READ_BLOCK = 1 << 20     # Скільки байтів читаємо за раз
+POLL_INTERVAL = 0.1      # Пауза між перевірками, коли нових даних немає (с)
+
+class LogFollower:
+    '''
+    Стежить за файлом логу як `tail -F`: повертає лише нові завершені рядки.
+    Обробляє обрізання файлу (читання починається спочатку) і ротацію
+    (старий файл дочитується до кінця, потім відкривається новий за тим самим шляхом).
+    '''
+
+    def __init__(self, file_path: str, from_start: bool = True, poll_interval: float = POLL_INTERVAL):
+        self.file_path = file_path
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+        self.rotations = 0
+        self.truncations = 0
+        self._file = None
+        self._pending = b""  # Незавершений останній рядок
+
+    def _open(self, seek_end: bool) -> bool:
+        try:
+            self._file = open(self.file_path, "rb")
+        except FileNotFoundError:
+            return False  # Під час ротації файлу може ненадовго не бути
+        if seek_end:
+            self._file.seek(0, os.SEEK_END)
+        self._pending = b""
+        return True
+
+    def _rotated(self) -> bool:
+        '''Чи вказує шлях уже на інший файл'''
+        try:
+            path_stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return False
+        file_stat = os.fstat(self._file.fileno())
+        return (path_stat.st_ino, path_stat.st_dev) != (file_stat.st_ino, file_stat.st_dev)
+
+    def _read_complete(self) -> bytes:
+        '''Читає доступні байти; повертає лише частину до останнього символу нового рядка'''
+        data = self._file.read(READ_BLOCK)
+        if not data:
+            return b""
+        data = self._pending + data
+        cut = data.rfind(b"\n") + 1
+        self._pending = data[cut:]
+        return data[:cut]
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        '''Асинхронно повертає блоки завершених рядків у міру їх появи'''
+        if not self._open(seek_end=not self.from_start):
+            raise FileNotFoundError(self.file_path)
+        try:
+            while True:
+                chunk = self._read_complete()
+                if chunk:
+                    yield chunk
+                    await asyncio.sleep(0)  # Даємо відпрацювати іншим задачам між блоками
+                    continue
+
+                if os.fstat(self._file.fileno()).st_size < self._file.tell():
+                    # Файл обрізали — читаємо з початку
+                    self.truncations += 1
+                    self._file.seek(0)
+                    self._pending = b""
+                elif self._rotated():
+                    # Старий файл дочитано до кінця — переходимо на новий
+                    if self._pending:
+                        yield self._pending + b"\n"
+                    self._file.close()
+                    self._file = None
+                    while not self._open(seek_end=False):
+                        await asyncio.sleep(self.poll_interval)
+                    self.rotations += 1
+                else:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            if self._file is not None:
+                self._file.close()
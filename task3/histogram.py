@@ -0,0 +1,113 @@
+import collections
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from logstore import INVALID_LEVEL, NO_TIMESTAMP, LogStore, format_timestamp, parse_timestamp
+
+try:
+    import numpy as np  # Необов'язкова залежність для векторизованого підрахунку
+except ImportError:
+    np = None
+
+class TimeHistogram:
+    '''
+    Агрегація записів логу за інтервалами часу за один прохід:
+    кількість записів кожного рівня в інтервалі і `top` найчастіших описів.
+    Інтервали вирівняні за epoch (для 1h — початок години, для 1d — початок доби).
+    Записи без коректного часу та некоректні рядки в інтервали не потрапляють.
+    '''
+
+    def __init__(self, levels: Sequence, interval: int, top: int = 3):
+        self.levels = tuple(levels)
+        self.interval = interval
+        self.top = top
+        self.counts: Dict[int, List[int]] = {}  # Початок інтервалу → кількість за кодами рівнів
+        self.descriptions: collections.Counter = collections.Counter()  # (початок, опис) → кількість
+        self._codes = {level: code for code, level in enumerate(self.levels)}
+
+    def _bucket_counts(self, bucket: int) -> List[int]:
+        counts = self.counts.get(bucket)
+        if counts is None:
+            self.counts[bucket] = counts = [0] * len(self.levels)
+        return counts
+
+    # ---- Наповнення ----
+
+    def add_store(self, store: LogStore) -> None:
+        '''Додає всі записи колонкового сховища (з NumPy — векторизовано)'''
+        if not len(store):
+            return
+        if np is not None:
+            timestamps = np.frombuffer(store.timestamps, dtype=np.int64)
+            level_ids = np.frombuffer(store.level_ids, dtype=np.int8)
+            valid = (timestamps != NO_TIMESTAMP) & (level_ids != INVALID_LEVEL)
+            buckets = timestamps[valid] // self.interval * self.interval
+            # Пара (інтервал, рівень) кодується одним числом, щоб порахувати все одним np.unique
+            keys, counts = np.unique(buckets * len(self.levels) + level_ids[valid], return_counts=True)
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                bucket, code = divmod(key, len(self.levels))
+                self._bucket_counts(bucket)[code] += n
+            rows = np.flatnonzero(valid).tolist()
+            row_buckets = buckets.tolist()
+        else:
+            rows = [i for i, (epoch, code) in enumerate(zip(store.timestamps, store.level_ids))
+                    if epoch != NO_TIMESTAMP and code != INVALID_LEVEL]
+            row_buckets = [store.timestamps[i] // self.interval * self.interval for i in rows]
+            for bucket, i in zip(row_buckets, rows):
+                self._bucket_counts(bucket)[store.level_ids[i]] += 1
+        if self.top:
+            buffer, starts, ends = store.buffer, store.desc_starts, store.line_ends
+            # Описи рахуються як байти: декодуються лише ті, що потраплять у результат
+            self.descriptions.update(zip(row_buckets, (bytes(buffer[starts[i]:ends[i]]) for i in rows)))
+
+    def add(self, log: Dict) -> None:
+        '''Додає один запис у форматі parse_log_line'''
+        if "level" not in log:
+            return
+        date, _, clock = log["timestamp"].partition(" ")
+        epoch = parse_timestamp(date.encode(), clock.encode())
+        if epoch == NO_TIMESTAMP:
+            return
+        bucket = epoch // self.interval * self.interval
+        self._bucket_counts(bucket)[self._codes[log["level"]]] += 1
+        if self.top:
+            self.descriptions[bucket, log["description"].encode()] += 1
+
+    def feed(self, logs: Iterable[Dict]) -> Iterator[Dict]:
+        '''Додає записи потоку і передає їх далі без змін — агрегація в тому ж проході, що й підрахунок'''
+        for log in logs:
+            self.add(log)
+            yield log
+
+    # ---- Результат ----
+
+    def rows(self) -> List[Tuple[int, Dict, List[Tuple[str, int]]]]:
+        '''Відсортовані рядки (початок інтервалу, {рівень: кількість}, [(опис, кількість), ...])'''
+        top: Dict[int, List[Tuple[str, int]]] = collections.defaultdict(list)
+        if self.top:
+            per_bucket = collections.defaultdict(collections.Counter)
+            for (bucket, description), n in self.descriptions.items():
+                per_bucket[bucket][description] = n
+            for bucket, counter in per_bucket.items():
+                top[bucket] = [(description.decode(errors="replace"), n) for description, n in counter.most_common(self.top)]
+        return [(bucket, {level: n for level, n in zip(self.levels, counts) if n}, top[bucket])
+                for bucket, counts in sorted(self.counts.items())]
+
+    def to_json(self) -> str:
+        buckets = [{"start": format_timestamp(bucket),
+                    "counts": {level.label: n for level, n in counts.items()},
+                    "total": sum(counts.values()),
+                    "top": [{"description": description, "count": n} for description, n in top]}
+                   for bucket, counts, top in self.rows()]
+        return json.dumps({"interval": self.interval, "buckets": buckets}, ensure_ascii=False, indent=2)
+
+    def to_csv(self) -> str:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["start", *(level.label for level in self.levels), "total", "top"])
+        for bucket, counts, top in self.rows():
+            writer.writerow([format_timestamp(bucket), *(counts.get(level, 0) for level in self.levels),
+                             sum(counts.values()), "; ".join(f"{description} ({n})" for description, n in top)])
+        return output.getvalue()
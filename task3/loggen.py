@@ -0,0 +1,111 @@
+import argparse
+import calendar
+import random
+import sys
+import time
+from typing import Dict
+
+from compressed import OPENERS
+
+# Частка рядків кожного рівня за замовчуванням (у відсотках)
+DEFAULT_MIX = {"INFO": 50, "DEBUG": 25, "WARN": 12, "ERROR": 10, "TRACE": 1.5, "CRITICAL": 0.7, "FATAL": 0.3, "VERBOSE": 0.5}
+DEFAULT_START = "2025-03-19 00:00:00"
+BATCH = 10_000  # Скільки рядків генерується і записується за раз
+
+MESSAGES = {
+    "INFO":     ("User {n} logged in.", "Request /api/v1/items/{n} served in {ms} ms.", "System update applied.",
+                 "Scheduled job {n} finished.", "Starting data backup process."),
+    "DEBUG":    ("Cache hit for key item:{n}.", "Debugging performance issues.", "Query took {ms} ms.",
+                 "Retrying connection (attempt {k})."),
+    "WARN":     ("Disk usage above 80%.", "High memory consumption detected.", "Slow response from upstream: {ms} ms.",
+                 "Potential security risk detected."),
+    "ERROR":    ("Database connection failed.", "Backup process failed.", "Timeout while calling service {k}.",
+                 "Failed to process order {n}."),
+    "CRITICAL": ("Low available disk space.", "Service {k} is unreachable."),
+    "FATAL":    ("Out of memory, shutting down.", "Configuration file is corrupted."),
+    "TRACE":    ("Entering handler {k}.", "Leaving handler {k}."),
+    "VERBOSE":  ("Payload size {n} bytes.", "Headers parsed: {k}."),
+}
+# Види некоректних рядків: сміття без структури, рядок без опису і невідомий рівень
+INVALID_KINDS = ("garbage", "truncated", "unknown-level")
+
+def parse_mix(text: str) -> Dict[str, float]:
+    '''"INFO=60,ERROR=20,..." → {"INFO": 60.0, "ERROR": 20.0, ...}'''
+    mix = {}
+    for part in text.split(","):
+        label, _, weight = part.partition("=")
+        label = label.strip().upper()
+        if label not in MESSAGES:
+            raise ValueError(f"невідомий рівень '{label}'")
+        mix[label] = float(weight)
+    if not any(mix.values()):
+        raise ValueError("сума часток має бути більшою за 0")
+    return mix
+
+def generate_lines(count: int, mix: Dict[str, float] = DEFAULT_MIX, invalid_rate: float = 0.0,
+                   seed: int = 42, start: str = DEFAULT_START):
+    '''
+    Детерміновано генерує `count` рядків логу блоками (списками рядків з "\\n").
+    Час зростає з випадковими кроками 0–2 с; частка `invalid_rate` рядків — некоректні.
+    '''
+    rnd = random.Random(seed)
+    labels, weights = list(mix), list(mix.values())
+    epoch = calendar.timegm(time.strptime(start, "%Y-%m-%d %H:%M:%S"))
+    stamp_epoch, stamp = None, ""
+    done = 0
+    while done < count:
+        size = min(BATCH, count - done)
+        levels = rnd.choices(labels, weights, k=size)
+        gaps = rnd.choices((0, 0, 0, 1, 1, 2), k=size)
+        invalid = [rnd.random() < invalid_rate for _ in range(size)] if invalid_rate else [False] * size
+        lines = []
+        for level, gap, bad in zip(levels, gaps, invalid):
+            epoch += gap
+            if epoch != stamp_epoch:  # Форматуємо час лише коли змінюється секунда
+                stamp_epoch, stamp = epoch, time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch))
+            if bad:
+                kind = rnd.choice(INVALID_KINDS)
+                if kind == "garbage":
+                    lines.append("".join(rnd.choices("abcdefghijklmnopqrstuvwxyz", k=rnd.randint(3, 12))) + "\n")
+                elif kind == "truncated":
+                    lines.append(f"{stamp} {level}\n")
+                else:
+                    lines.append(f"{stamp} NOTICE Unknown level line.\n")
+                continue
+            message = rnd.choice(MESSAGES[level])
+            if "{" in message:
+                message = message.format(n=rnd.randrange(1_000_000), ms=rnd.randrange(1, 5000), k=rnd.randrange(16))
+            lines.append(f"{stamp} {level} {message}\n")
+        done += size
+        yield lines
+
+def write_log(file_path: str, count: int, mix: Dict[str, float] = DEFAULT_MIX, invalid_rate: float = 0.0,
+              seed: int = 42, start: str = DEFAULT_START) -> int:
+    '''Записує згенерований лог у файл (.gz/.bz2/.xz — стиснений); повертає розмір розпакованих даних у байтах'''
+    opener = {".gz": OPENERS["gzip"], ".bz2": OPENERS["bz2"], ".xz": OPENERS["xz"]}.get(
+        file_path[file_path.rfind("."):].lower(), open)
+    size = 0
+    with opener(file_path, "wb") as file:
+        for lines in generate_lines(count, mix, invalid_rate, seed, start):
+            data = "".join(lines).encode()
+            file.write(data)
+            size += len(data)
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description="Генератор синтетичних логів для task3")
+    parser.add_argument("output", help="файл результату (.log, .gz, .bz2, .xz)")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="кількість рядків")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help='частки рівнів, напр. "INFO=60,ERROR=30,WARN=10"')
+    parser.add_argument("--invalid", type=float, default=0.01, help="частка некоректних рядків 0..1")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", default=DEFAULT_START, help="час першого рядка")
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    size = write_log(args.output, args.lines, args.mix, args.invalid, args.seed, args.start)
+    seconds = time.perf_counter() - began
+    print(f"{args.output}: {args.lines} рядків, {size / 1024 / 1024:.1f} МіБ за {seconds:.1f} с", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import heapq
+import os
+import struct
+import zlib
+from array import array
+from typing import Dict, Iterable, Sequence, Tuple
+
+from logstore import INVALID_LEVEL, LogStore, map_file, parse_ranges, split_at_newlines
+
+# Файл індексу лежить поруч із логом: <file.log>.idx
+INDEX_SUFFIX = ".idx"
+_MAGIC = b"LGIX"
+_VERSION = 1
+# Сигнатура, розмір і mtime логу, кінець проіндексованої частини, к-сть некоректних рядків, CRC хвоста
+_HEADER = struct.Struct("<4sBQqQQI")
+_LEVEL = struct.Struct("<HQ")  # Довжина назви рівня і кількість зсувів
+_FINGERPRINT_SIZE = 4096       # Скільки байтів перед кінцем індексу перевіряється на незмінність
+
+def index_path(file_path: str) -> str:
+    return file_path + INDEX_SUFFIX
+
+def _fingerprint(buffer, end: int) -> int:
+    return zlib.crc32(buffer[max(0, end - _FINGERPRINT_SIZE):end])
+
+class LogIndex:
+    '''
+    Індекс логу: для кожного рівня — відсортовані зсуви початків рядків, плюс кількість некоректних рядків.
+    Охоплює файл до останнього символу нового рядка (`indexed_offset`);
+    незавершений хвіст файлу щоразу розбирається окремо і до індексу не потрапляє.
+    '''
+
+    def __init__(self, file_path: str, levels: Sequence):
+        self.file_path = file_path
+        self.levels = tuple(levels)
+        self.offsets: Dict[str, array] = {level.label: array('Q') for level in self.levels}
+        self.invalid_count = 0
+        self.indexed_offset = 0
+        self.size = 0
+        self.mtime_ns = 0
+        self.fingerprint = 0
+        self.buffer = b""
+        self.tail: LogStore | None = None  # Рядки після indexed_offset
+
+    # ---- Побудова та оновлення ----
+
+    def update(self, buffer, jobs: int = 1) -> None:
+        '''Дорозбирає файл від `indexed_offset` до останнього нового рядка і хвіст після нього'''
+        self.buffer = buffer
+        end = buffer.rfind(b"\n") + 1
+        if end > self.indexed_offset:
+            labels = [level.label for level in self.levels]
+            ranges = split_at_newlines(buffer, jobs, self.indexed_offset, end)
+            for _, level_ids, line_starts, _, _ in parse_ranges(self.file_path, self.levels, ranges, jobs):
+                for code, line_start in zip(level_ids, line_starts):
+                    if code == INVALID_LEVEL:
+                        self.invalid_count += 1
+                    else:
+                        self.offsets[labels[code]].append(line_start)
+            self.indexed_offset = end
+        self.fingerprint = _fingerprint(buffer, self.indexed_offset)
+        self.tail = self._parse(self.indexed_offset, len(buffer))
+
+    def _parse(self, start: int, end: int) -> LogStore:
+        store = LogStore(self.buffer, self.levels)
+        store.parse_range(start, end)
+        return store
+
+    # ---- Запити ----
+
+    def counts(self) -> Tuple[Dict, int]:
+        '''Кількість записів за рівнями (разом з хвостом) і кількість некоректних рядків'''
+        tail_counts, tail_invalid = self.tail.counts() if self.tail is not None else ({}, 0)
+        counts = {}
+        for level in self.levels:
+            n = len(self.offsets[level.label]) + tail_counts.get(level, 0)
+            if n:
+                counts[level] = n
+        return counts, self.invalid_count + tail_invalid
+
+    def select(self, levels: Iterable) -> LogStore:
+        '''Сховище лише з рядками вибраних рівнів: розбираються тільки рядки за зсувами з індексу'''
+        levels = set(levels)
+        store = LogStore(self.buffer, self.levels)
+        merged = heapq.merge(*(self.offsets[level.label] for level in self.levels if level in levels))
+        for line_start in merged:
+            newline = self.buffer.find(b"\n", line_start)
+            store.append_span(line_start, len(self.buffer) if newline == -1 else newline)
+        if self.tail is not None and len(self.tail):
+            store.extend(self.tail.select_levels(levels).columns())
+        return store
+
+    # ---- Читання та запис файлу індексу ----
+
+    def save(self, path: str) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self.size, self.mtime_ns, self.indexed_offset,
+                                    self.invalid_count, self.fingerprint))
+            for label, offsets in self.offsets.items():
+                name = label.encode()
+                file.write(_LEVEL.pack(len(name), len(offsets)))
+                file.write(name)
+                offsets.tofile(file)
+        os.replace(tmp_path, path)  # Атомарна заміна: обірваний запис не зіпсує старий індекс
+
+    @classmethod
+    def read(cls, path: str, file_path: str, levels: Sequence) -> "LogIndex | None":
+        '''Читає індекс; None, якщо файлу немає або він пошкоджений чи іншої версії'''
+        index = cls(file_path, levels)
+        try:
+            with open(path, "rb") as file:
+                magic, version, index.size, index.mtime_ns, index.indexed_offset, index.invalid_count, \
+                    index.fingerprint = _HEADER.unpack(file.read(_HEADER.size))
+                if (magic, version) != (_MAGIC, _VERSION):
+                    return None
+                while header := file.read(_LEVEL.size):
+                    name_len, count = _LEVEL.unpack(header)
+                    label = file.read(name_len).decode()
+                    offsets = array('Q')
+                    offsets.fromfile(file, count)
+                    if label in index.offsets:
+                        index.offsets[label] = offsets
+        except (OSError, struct.error, EOFError, UnicodeDecodeError):
+            return None
+        return index
+
+def load_index(file_path: str, levels: Sequence, jobs: int = 1) -> LogIndex:
+    '''
+    Повертає актуальний індекс логу.
+    Той самий розмір і mtime — індекс використовується як є; файл став більшим і збігається CRC
+    проіндексованого хвоста (файл лише доповнено в кінці) — дорозбираються тільки нові байти;
+    інакше (зокрема інший mtime при тому самому чи меншому розмірі — редагування на місці) індекс будується заново.
+    Оновлений індекс зберігається поруч із логом, якщо каталог доступний для запису.
+    '''
+    stat = os.stat(file_path)
+    buffer = map_file(file_path)
+    path = index_path(file_path)
+    index = LogIndex.read(path, file_path, levels)
+
+    if index is not None and (index.size, index.mtime_ns) == (stat.st_size, stat.st_mtime_ns) \
+            and index.indexed_offset <= len(buffer):
+        index.buffer = buffer
+        index.tail = index._parse(index.indexed_offset, len(buffer))
+        return index
+
+    if index is None or stat.st_size <= index.size or index.indexed_offset > len(buffer) \
+            or _fingerprint(buffer, index.indexed_offset) != index.fingerprint:
+        index = LogIndex(file_path, levels)  # Файл змінено не дописуванням — будуємо з нуля
+
+    index.update(buffer, jobs)
+    index.size, index.mtime_ns = stat.st_size, stat.st_mtime_ns
+    try:
+        index.save(path)
+    except OSError:
+        pass  # Каталог лише для читання — працюємо без збереження індексу
+    return index
@@ -0,0 +1,319 @@
+import calendar
+import mmap
+import re
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import compress
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+
+from compressed import detect_format, read_all
+
+# Рядок логу: <дата> <час> <РІВЕНЬ> <опис>. Пробільні символи — лише ASCII, як у bytes.split()
+_WS = rb"[ \t\r\f\v]"
+LINE_RE = re.compile(rb"%s*(\S+)%s+(\S+)%s+(\S+)%s+(\S(?:[^\n]*\S)?)%s*\Z" % (_WS, _WS, _WS, _WS, _WS))
+DATE_RE = re.compile(rb"(\d{4})-(\d{2})-(\d{2})\Z")
+TIME_RE = re.compile(rb"(\d{2}):(\d{2}):(\d{2})\Z")
+HEAD_RE = re.compile(rb"%s*(\S+)%s+(\S+)" % (_WS, _WS))  # Дата і час на початку рядка
+
+COLUMNS = ("timestamps", "level_ids", "line_starts", "desc_starts", "line_ends")
+MAX_JOB_CHUNK = 64 * 1024 * 1024  # Найбільший шматок файлу для одного завдання пулу
+
+NO_TIMESTAMP = -(1 << 63)  # Час не вдалося перетворити на epoch — береться текст з буфера
+INVALID_LEVEL = -1         # Код рівня для некоректного рядка
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+@lru_cache(maxsize=256)
+def _day_epoch(date: bytes) -> int:
+    '''Epoch початку доби (UTC) або NO_TIMESTAMP; дата в лозі змінюється рідко, тож розбір кешується'''
+    d = DATE_RE.match(date)
+    if d is None:
+        return NO_TIMESTAMP
+    parts = tuple(map(int, d.groups()))
+    try:
+        datetime(*parts)  # Перевірка коректності дати (щоб текст відновлювався без змін)
+    except ValueError:
+        return NO_TIMESTAMP
+    return calendar.timegm(parts + (0, 0, 0))
+
+def parse_timestamp(date: bytes, clock: bytes) -> int:
+    '''Перетворює дату і час на epoch-секунди (UTC); NO_TIMESTAMP, якщо формат нестандартний'''
+    day = _day_epoch(date)
+    t = TIME_RE.match(clock)
+    if day == NO_TIMESTAMP or t is None:
+        return NO_TIMESTAMP
+    hours, minutes, seconds = map(int, t.groups())
+    if hours > 23 or minutes > 59 or seconds > 59:
+        return NO_TIMESTAMP
+    return day + hours * 3600 + minutes * 60 + seconds
+
+def format_timestamp(epoch: int) -> str:
+    return time.strftime(TIME_FORMAT, time.gmtime(epoch))
+
+class LogStore:
+    '''
+    Компактне колонкове сховище розібраних рядків логу.
+    Замість словника на кожен рядок зберігаються масиви: час (epoch), код рівня,
+    і зсуви рядка та опису в буфері файлу (mmap), тож тексти не копіюються.
+    Для сумісності поводиться як Dict[int, Dict] (`len`, `[i]`, `items()`, `values()`),
+    створюючи словник запису лише на вимогу.
+    '''
+
+    def __init__(self, buffer, levels: Sequence, encoding: str = "utf-8"):
+        self.buffer = buffer
+        self.levels = tuple(levels)      # Коди рівнів — індекси в цьому кортежі
+        self.encoding = encoding
+        self.level_codes = {level.label.encode(): code for code, level in enumerate(self.levels)}
+        self.timestamps = array('q')
+        self.level_ids = array('b')
+        self.line_starts = array('Q')    # Початок рядка (без провідних пробілів)
+        self.desc_starts = array('Q')    # Початок опису (для некоректних — початок рядка)
+        self.line_ends = array('Q')      # Кінець рядка (без кінцевих пробілів)
+        self._stamp = (b"", b"", NO_TIMESTAMP)  # Останні дата, час і їх epoch: сусідні рядки зазвичай з тієї ж секунди
+
+    @classmethod
+    def from_file(cls, file_path: str, levels: Sequence, encoding: str = "utf-8", jobs: int = 1,
+                  since: int | None = None, until: int | None = None) -> "LogStore":
+        '''
+        Відкриває файл через mmap і розбирає всі непорожні рядки.
+        З `jobs > 1` файл ділиться по межах рядків і шматки розбираються в пулі процесів;
+        колонки зливаються в початковому порядку, тож результат такий самий, як у послідовному режимі.
+        `since`/`until` (epoch, включно) обмежують розбір вікном часу, знайденим двійковим пошуком.
+        Стиснений файл розпаковується в пам'ять і розбирається в одному процесі.
+        '''
+        store = cls(map_file(file_path), levels, encoding)
+        start, end = time_range(store.buffer, since, until)
+        if jobs <= 1 or not isinstance(store.buffer, mmap.mmap):
+            store.parse_range(start, end)
+            return store
+        for columns in parse_ranges(file_path, store.levels, split_at_newlines(store.buffer, jobs, start, end), jobs):
+            store.extend(columns)
+        return store
+
+    def parse_range(self, start: int, end: int) -> None:
+        '''Розбирає рядки буфера в межах [start, end) і додає їх у кінець сховища'''
+        # Гарячий цикл: методи і колонки прив'язані до локальних імен, коректний рядок обробляється на місці
+        buffer, find, match_line, codes = self.buffer, self.buffer.find, LINE_RE.match, self.level_codes
+        timestamps, level_ids = self.timestamps.append, self.level_ids.append
+        line_starts, desc_starts, line_ends = self.line_starts.append, self.desc_starts.append, self.line_ends.append
+        last_date, last_clock, epoch = self._stamp
+        pos = start
+        while pos < end:
+            newline = find(b"\n", pos, end)
+            line_end = end if newline == -1 else newline
+            match = match_line(buffer, pos, line_end)
+            if match is not None and (code := codes.get(match.group(3))) is not None:
+                date, clock = match.group(1, 2)
+                if clock != last_clock or date != last_date:
+                    last_date, last_clock, epoch = date, clock, parse_timestamp(date, clock)
+                timestamps(epoch)
+                level_ids(code)
+                line_starts(match.start(1))
+                desc_starts(match.start(4))
+                line_ends(match.end(4))
+            else:
+                self._append_invalid(pos, line_end)
+            pos = line_end + 1
+        self._stamp = (last_date, last_clock, epoch)
+
+    def append_span(self, line_start: int, line_end: int) -> bool:
+        '''Додає рядок buffer[line_start:line_end]. Повертає False для порожнього рядка'''
+        match = LINE_RE.match(self.buffer, line_start, line_end)
+        if match is not None and (code := self.level_codes.get(match.group(3))) is not None:
+            date, clock = match.group(1, 2)
+            if (date, clock) != self._stamp[:2]:
+                self._stamp = (date, clock, parse_timestamp(date, clock))
+            self.timestamps.append(self._stamp[2])
+            self.level_ids.append(code)
+            self.line_starts.append(match.start(1))
+            self.desc_starts.append(match.start(4))
+            self.line_ends.append(match.end(4))
+            return True
+        return self._append_invalid(line_start, line_end)
+
+    def _append_invalid(self, line_start: int, line_end: int) -> bool:
+        '''Некоректний рядок зберігається як є (без часу і рівня); порожній пропускається'''
+        buffer = self.buffer
+        stripped = buffer[line_start:line_end].strip()
+        if not stripped:
+            return False
+        first = line_start + buffer[line_start:line_end].index(stripped[:1])
+        self.timestamps.append(NO_TIMESTAMP)
+        self.level_ids.append(INVALID_LEVEL)
+        self.line_starts.append(first)
+        self.desc_starts.append(first)
+        self.line_ends.append(first + len(stripped))
+        return True
+
+    def __len__(self) -> int:
+        return len(self.level_ids)
+
+    def level(self, index: int):
+        '''Рівень запису або None для некоректного рядка'''
+        code = self.level_ids[index]
+        return self.levels[code] if code != INVALID_LEVEL else None
+
+    def timestamp(self, index: int) -> str:
+        epoch = self.timestamps[index]
+        if epoch != NO_TIMESTAMP:
+            return format_timestamp(epoch)
+        head = self.buffer[self.line_starts[index]:self.desc_starts[index]].split()
+        return b" ".join(head[:2]).decode(self.encoding, errors="replace")
+
+    def description(self, index: int) -> str:
+        return self.buffer[self.desc_starts[index]:self.line_ends[index]].decode(self.encoding, errors="replace")
+
+    def raw(self, index: int) -> str:
+        return self.buffer[self.line_starts[index]:self.line_ends[index]].decode(self.encoding, errors="replace")
+
+    def __getitem__(self, index: int) -> Dict:
+        if not 0 <= index < len(self):
+            raise KeyError(index)
+        level = self.level(index)
+        if level is None:
+            return {"raw": self.raw(index)}
+        return {"timestamp": self.timestamp(index), "level": level, "description": self.description(index)}
+
+    def keys(self) -> range:
+        return range(len(self))
+
+    def values(self) -> Iterator[Dict]:
+        return (self[i] for i in range(len(self)))
+
+    def items(self) -> Iterator[Tuple[int, Dict]]:
+        return ((i, self[i]) for i in range(len(self)))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self)))
+
+    def counts(self) -> Tuple[Dict, int]:
+        '''Підрахунок записів за рівнями та кількість некоректних рядків'''
+        per_code = [self.level_ids.count(code) for code in range(len(self.levels))]
+        counts = {level: n for level, n in zip(self.levels, per_code) if n}
+        return counts, self.level_ids.count(INVALID_LEVEL)
+
+    def columns(self) -> Tuple[array, ...]:
+        return tuple(getattr(self, name) for name in COLUMNS)
+
+    def extend(self, columns: Tuple[array, ...]) -> None:
+        '''Дописує в кінець колонки іншого сховища з тим самим буфером і рівнями'''
+        for name, column in zip(COLUMNS, columns):
+            getattr(self, name).extend(column)
+
+    def select(self, indices: Iterable[int]) -> "LogStore":
+        '''Нове сховище з вибраних рядків (спільний буфер, копіюються лише колонки)'''
+        subset = LogStore(self.buffer, self.levels, self.encoding)
+        indices = indices if isinstance(indices, array) else array('Q', indices)
+        for name in COLUMNS:
+            column = getattr(self, name)
+            # array з ітератора дописує елементи по одному, без проміжного списку Python-об'єктів
+            setattr(subset, name, array(column.typecode, map(column.__getitem__, indices)))
+        return subset
+
+    def select_levels(self, levels: Iterable) -> "LogStore":
+        codes = {self.levels.index(level) for level in levels}
+        return self.select(array('Q', compress(range(len(self)), map(codes.__contains__, self.level_ids))))
+
+def map_file(file_path: str):
+    '''
+    Відображає файл у пам'ять лише для читання (порожній файл — порожні байти).
+    Стиснений файл (.gz, .bz2, .xz) розпаковується в bytearray.
+    '''
+    if detect_format(file_path) is not None:
+        return read_all(file_path)
+    with open(file_path, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Порожній файл не можна відобразити в пам'ять
+            return b""
+
+def split_at_newlines(buffer, jobs: int, start: int = 0, end: int | None = None) -> list[Tuple[int, int]]:
+    '''
+    Ділить діапазон буфера [start, end) на частини, що закінчуються на межі рядка.
+    Шматків не менше ніж `jobs` і не більших за MAX_JOB_CHUNK, щоб пам'ять процесів пулу була обмежена.
+    '''
+    end = len(buffer) if end is None else end
+    size = end - start
+    parts = max(jobs, -(-size // MAX_JOB_CHUNK), 1)
+    points = [start]
+    for i in range(1, parts):
+        pos = max(start + size * i // parts, points[-1])
+        newline = buffer.find(b"\n", pos, end)
+        points.append(end if newline == -1 else newline + 1)
+    points.append(end)
+    return [(a, b) for a, b in zip(points, points[1:]) if b > a]
+
+def parse_ranges(file_path: str, levels: Sequence, ranges: Sequence[Tuple[int, int]], jobs: int) -> Iterator[Tuple[array, ...]]:
+    '''Розбирає діапазони файлу в пулі з `jobs` процесів; колонки повертаються в порядку діапазонів'''
+    labels = [level.label for level in levels]
+    if jobs <= 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            yield _parse_chunk(file_path, labels, start, end)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(_parse_chunk, *zip(*((file_path, labels, start, end) for start, end in ranges)))
+
+def _parse_chunk(file_path: str, labels: Sequence[str], start: int, end: int) -> Tuple[array, ...]:
+    '''Розбирає діапазон файлу в процесі пулу і повертає колонки (зсуви — абсолютні)'''
+    store = LogStore(map_file(file_path), [SimpleNamespace(label=label) for label in labels])
+    store.parse_range(start, end)
+    return store.columns()
+
+def _count_chunk(file_path: str, labels: Sequence[str], start: int, end: int) -> array:
+    '''Рахує рядки кожного рівня в діапазоні файлу; останній елемент — некоректні рядки'''
+    level_ids = _parse_chunk(file_path, labels, start, end)[1]
+    return array('Q', [level_ids.count(code) for code in range(len(labels))] + [level_ids.count(INVALID_LEVEL)])
+
+def count_file(file_path: str, levels: Sequence, jobs: int) -> Tuple[Dict, int]:
+    '''Паралельний підрахунок рівнів без збереження записів у батьківському процесі'''
+    levels = tuple(levels)
+    labels = [level.label for level in levels]
+    ranges = split_at_newlines(map_file(file_path), jobs)
+    totals = [0] * (len(levels) + 1)
+    with ProcessPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        for chunk_counts in pool.map(_count_chunk, *zip(*((file_path, labels, start, end) for start, end in ranges))):
+            totals = [a + b for a, b in zip(totals, chunk_counts)]
+    counts = {level: n for level, n in zip(levels, totals) if n}
+    return counts, totals[-1]
+
+def _first_timestamp(buffer, pos: int, end: int) -> Tuple[int | None, int]:
+    '''
+    Шукає перший рядок з коректним часом, починаючи з початку рядка `pos`.
+    Повертає (epoch, кінець цього рядка) або (None, end), якщо такого рядка до `end` немає.
+    '''
+    while pos < end:
+        newline = buffer.find(b"\n", pos, end)
+        line_end = end if newline == -1 else newline
+        match = HEAD_RE.match(buffer, pos, line_end)
+        if match is not None:
+            epoch = parse_timestamp(match.group(1), match.group(2))
+            if epoch != NO_TIMESTAMP:
+                return epoch, line_end
+        pos = line_end + 1
+    return None, end
+
+def bisect_time(buffer, epoch: int, lo: int = 0, hi: int | None = None) -> int:
+    '''
+    Двійковий пошук по байтових зсувах упорядкованого за часом логу:
+    повертає початок першого рядка, час якого >= `epoch`.
+    Рядки без часу належать до найближчого наступного рядка з часом.
+    '''
+    hi = len(buffer) if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        line_start = max(lo, buffer.rfind(b"\n", 0, mid) + 1)
+        found, line_end = _first_timestamp(buffer, line_start, hi)
+        if found is None or found >= epoch:
+            hi = line_start
+        else:
+            lo = min(line_end + 1, hi)
+    return lo
+
+def time_range(buffer, since: int | None = None, until: int | None = None) -> Tuple[int, int]:
+    '''Межі байтів [start, end) рядків з часом у вікні [since, until]'''
+    start = bisect_time(buffer, since) if since is not None else 0
+    end = bisect_time(buffer, until + 1, start) if until is not None else len(buffer)
+    return start, max(start, end)
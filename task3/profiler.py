@@ -0,0 +1,149 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, List
+
+class StageRecord:
+    '''Підсумок одного етапу: час (власний, без вкладених етапів), CPU, кількість рядків і пік пам'яті'''
+
+    __slots__ = ("name", "wall", "cpu", "lines", "calls", "peak")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.lines = 0
+        self.calls = 0
+        self.peak: int | None = None  # Пік tracemalloc (байти); лише для етапів stage()
+
+    def as_dict(self) -> Dict:
+        return {"stage": self.name, "wall_s": self.wall, "cpu_s": self.cpu, "lines": self.lines,
+                "calls": self.calls, "peak_bytes": self.peak}
+
+class StageProfiler:
+    '''
+    Профілювання етапів конвеєра: `stage(name)` — блок коду, `iterate(name, it)` — етап потоку.
+    Час завжди нараховується етапу, що виконується зараз (вершина стеку), тож вкладені
+    й переплетені етапи (читання → розбір → підрахунок в одному проході) не рахуються двічі.
+    '''
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.records: Dict[str, StageRecord] = {}
+        self._stack: List[StageRecord] = []
+        self._mark = (time.perf_counter(), time.process_time())
+
+    def record(self, name: str) -> StageRecord:
+        record = self.records.get(name)
+        if record is None:
+            self.records[name] = record = StageRecord(name)
+        return record
+
+    def _switch(self):
+        '''Нараховує час від попереднього перемикання етапу на вершині стеку'''
+        now = (time.perf_counter(), time.process_time())
+        if self._stack:
+            top = self._stack[-1]
+            top.wall += now[0] - self._mark[0]
+            top.cpu += now[1] - self._mark[1]
+        self._mark = now
+
+    def _push(self, record: StageRecord):
+        self._switch()
+        self._stack.append(record)
+
+    def _pop(self):
+        self._switch()
+        self._stack.pop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record = self.record(name)
+        record.calls += 1
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._propagate_peak()
+            tracemalloc.reset_peak()
+        self._push(record)
+        try:
+            yield record
+        finally:
+            self._pop()
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                record.peak = max(record.peak or 0, peak)
+                self._propagate_peak(peak)
+
+    def _propagate_peak(self, peak: int | None = None):
+        '''Пік, досягнутий усередині вкладеного етапу, враховується і в зовнішніх'''
+        peak = tracemalloc.get_traced_memory()[1] if peak is None else peak
+        for outer in self._stack:
+            outer.peak = max(outer.peak or 0, peak)
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        '''Пропускає елементи потоку без змін, рахуючи їх і час, витрачений на їх отримання'''
+        record = self.record(name)
+        record.calls += 1
+        iterator = iter(iterable)
+        while True:
+            self._push(record)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._pop()
+            record.lines += 1
+            yield item
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        return self
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # ---- Звіт ----
+
+    def to_json(self) -> str:
+        return json.dumps({"stages": [record.as_dict() for record in self.records.values()]}, ensure_ascii=False, indent=2)
+
+    def render(self) -> str:
+        lines = ["╔════════════╤══════════╤══════════╤════════════╤═════════════╤═══════════════╗",
+                 "║ Етап       │ Час, с   │ CPU, с   │ Рядків     │ Рядків/с    │ Пік пам., МіБ ║",
+                 "╟────────────┼──────────┼──────────┼────────────┼─────────────┼───────────────╢"]
+        for record in self.records.values():
+            rate = f"{record.lines / record.wall:.0f}" if record.lines and record.wall else "—"
+            peak = f"{record.peak / 1024 / 1024:.2f}" if record.peak is not None else "—"
+            lines.append(f"║ {record.name:<10} │ {record.wall:>8.3f} │ {record.cpu:>8.3f} │ {record.lines or '—':>10} │ "
+                         f"{rate:>11} │ {peak:>13} ║")
+        lines.append("╚════════════╧══════════╧══════════╧════════════╧═════════════╧═══════════════╝")
+        return "\n".join(lines)
+
+class _NullRecord:
+    '''Запис, який нічого не зберігає: присвоєння `lines` просто ігнорується'''
+    __slots__ = ()
+
+    @property
+    def lines(self) -> int:
+        return 0
+
+    @lines.setter
+    def lines(self, value: int):
+        pass
+
+class NullProfiler:
+    '''Профілювання вимкнено: етапи не обгортаються, потоки повертаються як є'''
+
+    _record = _NullRecord()
+
+    def stage(self, name: str) -> nullcontext:
+        return nullcontext(self._record)
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterable:
+        return iterable
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,168 @@
+import bisect
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, List
+
+TOKEN_RE = re.compile(r"\w+")
+ANSI_RE = re.compile(r"(\033\[[0-9;?]*[A-Za-z])")
+HIGHLIGHT_ON, HIGHLIGHT_OFF = "\033[7m", "\033[27m"  # Інверсія без зміни кольору рядка
+CURSOR_FANOUT = 64       # До стількох слів з префіксом запиту — окремий bisect у кожному списку
+DENSE_GAP = 64           # Префікс, що трапляється частіше ніж раз на стільки рядків, шукається переглядом рядків
+UNION_CACHE = 16         # Скільки об'єднаних списків тримати (інкрементальний пошук повертається до префіксів)
+SCAN_LIMIT = 20_000      # Скільки рядків переглядається за раз (поки індекс будується або для частого префікса)
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+class SearchIndex:
+    '''
+    Інвертований індекс «слово → відсортовані номери рядків» для пошуку в переглядачі.
+    Будується у фоновому потоці після першого `/` (`start`), тож не затримує перший екран
+    і не займає пам'ять, якщо пошуком не користуються; до завершення побудови
+    пошук переглядає рядки по черзі (не більше SCAN_LIMIT за раз).
+    Запит — одне або кілька слів; рядок підходить, якщо кожне слово запиту є початком якогось слова рядка.
+    Повний список збігів не будується: `next_match` шукає лише наступний збіг від поточного рядка.
+    '''
+
+    def __init__(self, total: int, text: Callable[[int], str]):
+        self.total = total
+        self.text = text
+        self.tokens: List[str] = []        # Відсортовані слова для пошуку за префіксом
+        self.postings: List[array] = []    # Номери рядків для кожного слова з `tokens`
+        self.sizes = array('Q', [0])       # Накопичена довжина списків: скільки входжень мають слова tokens[a:b]
+        self.progress = 0
+        self.ready = threading.Event()
+        self._unions: OrderedDict[str, array] = OrderedDict()
+        self._thread = threading.Thread(target=self._build, daemon=True)
+
+    @property
+    def started(self) -> bool:
+        return self._thread.ident is not None
+
+    def start(self) -> "SearchIndex":
+        if not self.started:
+            self._thread.start()
+        return self
+
+    def _build(self) -> None:
+        postings: dict[str, array] = {}
+        for row in range(self.total):
+            for token in set(tokenize(self.text(row))):
+                rows = postings.get(token)
+                if rows is None:
+                    postings[token] = rows = array('I')
+                rows.append(row)
+            self.progress = row + 1
+        tokens = sorted(postings)
+        self.postings = [postings.pop(token) for token in tokens]
+        for rows in self.postings:
+            self.sizes.append(self.sizes[-1] + len(rows))
+        self.tokens = tokens
+        self.ready.set()
+
+    # ---- Пошук наступного збігу ----
+
+    def _cursor(self, term: str) -> Callable[[int, bool], int | None]:
+        '''
+        Функція «найближчий рядок ≥ row (або ≤ row назад), що містить слово з префіксом `term`».
+        Небагато слів з таким префіксом — bisect у кожному списку; багато, але рідко — один
+        об'єднаний список (кешується); дуже часто — перегляд рядків поспіль (збіг майже поруч).
+        '''
+        start = bisect.bisect_left(self.tokens, term)
+        end = bisect.bisect_left(self.tokens, term[:-1] + chr(ord(term[-1]) + 1), start)
+        if end - start <= CURSOR_FANOUT:
+            lists = self.postings[start:end]
+            def nearest(row: int, forward: bool) -> int | None:
+                best = None
+                for rows in lists:
+                    if forward:
+                        i = bisect.bisect_left(rows, row)
+                        if i < len(rows) and (best is None or rows[i] < best):
+                            best = rows[i]
+                    else:
+                        i = bisect.bisect_right(rows, row) - 1
+                        if i >= 0 and (best is None or rows[i] > best):
+                            best = rows[i]
+                return best
+            return nearest
+        def in_union(row: int, forward: bool) -> int | None:
+            union = self._union(term, start, end)
+            i = bisect.bisect_left(union, row) if forward else bisect.bisect_right(union, row) - 1
+            return union[i] if 0 <= i < len(union) else None
+        if (self.sizes[end] - self.sizes[start]) * DENSE_GAP < self.total:
+            return in_union
+        def nearest(row: int, forward: bool) -> int | None:
+            # Часте слово зазвичай знаходиться за кілька рядків; якщо ні — точна відповідь з об'єднаного списку
+            step = 1 if forward else -1
+            stop = min(self.total, row + SCAN_LIMIT) if forward else max(-1, row - SCAN_LIMIT)
+            for i in range(row, stop, step):
+                if any(word.startswith(term) for word in tokenize(self.text(i))):
+                    return i
+            return in_union(row, forward) if 0 <= stop < self.total else None
+        return nearest
+
+    def _union(self, term: str, start: int, end: int) -> array:
+        union = self._unions.get(term)
+        if union is None:
+            union = array('I', sorted(set().union(*self.postings[start:end])))
+            self._unions[term] = union
+            if len(self._unions) > UNION_CACHE:
+                self._unions.popitem(last=False)
+        else:
+            self._unions.move_to_end(term)
+        return union
+
+    def _nearest(self, cursors: list, row: int, forward: bool) -> int | None:
+        '''Перший рядок від `row` у напрямку пошуку, що є в усіх курсорах: кожен по черзі «перестрибує» до наступного кандидата'''
+        while True:
+            agreed = True
+            for cursor in cursors:
+                found = cursor(row, forward)
+                if found is None:
+                    return None
+                if found != row:
+                    row, agreed = found, False
+            if agreed:
+                return row
+
+    def next_match(self, query: str, row: int, forward: bool = True) -> int | None:
+        '''Найближчий збіг після (або до) рядка `row`, з переходом по колу; None — збігів немає'''
+        terms = tokenize(query)
+        if not terms or not self.total:
+            return None
+        if not self.ready.is_set():
+            return self._scan(terms, row, forward)
+        # Починаємо з найдовшого слова — у нього найменше збігів
+        cursors = [self._cursor(term) for term in sorted(set(terms), key=len, reverse=True)]
+        if forward:
+            found = self._nearest(cursors, row + 1, True) if row + 1 < self.total else None
+            return found if found is not None else self._nearest(cursors, 0, True)
+        found = self._nearest(cursors, row - 1, False) if row > 0 else None
+        return found if found is not None else self._nearest(cursors, self.total - 1, False)
+
+    def _scan(self, terms: List[str], row: int, forward: bool) -> int | None:
+        '''Поки індекс будується: перегляд рядків по колу, не більше SCAN_LIMIT'''
+        step = 1 if forward else -1
+        for i in range(1, min(self.total, SCAN_LIMIT) + 1):
+            candidate = (row + step * i) % self.total
+            if self._matches(candidate, terms):
+                return candidate
+        return None
+
+    def _matches(self, row: int, terms: List[str]) -> bool:
+        words = tokenize(self.text(row))
+        return all(any(word.startswith(term) for word in words) for term in terms)
+
+def highlight(line: str, query: str) -> str:
+    '''Підсвічує слова, що починаються зі слів запиту, не зачіпаючи ANSI-послідовності рядка'''
+    terms = tokenize(query)
+    if not terms:
+        return line
+    pattern = re.compile(r"\b(?:%s)\w*" % "|".join(map(re.escape, terms)), re.IGNORECASE)
+    parts = ANSI_RE.split(line)
+    # Непарні елементи — escape-послідовності, парні — видимий текст
+    for i in range(0, len(parts), 2):
+        parts[i] = pattern.sub(lambda m: f"{HIGHLIGHT_ON}{m.group()}{HIGHLIGHT_OFF}", parts[i])
+    return "".join(parts)
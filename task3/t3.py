@@ -1,8 +1,24 @@
+import asyncio
+import calendar
+import cProfile
 import collections
+import glob
+import heapq
+import operator
+import os
+import re
 import sys
+import time
 import view
+from compressed import detect_format, open_text
+from follow import LogFollower
+from histogram import TimeHistogram
+from logindex import index_path, load_index
+from logstore import NO_TIMESTAMP, LogStore, count_file, format_timestamp, parse_timestamp
+from profiler import NULL_PROFILER, StageProfiler
+from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
 
 # Константи для кольорів (ANSI-коди)
 COL_RESET      = '\033[0m'      # Стандартний колір
@@ -15,8 +31,6 @@ COL_INV_YELLOW = '\033[1;7;33m' # Інверсний жовтий жирний (
 COL_INV_RED    = '\033[41m'     # Інверсний червоний (на червоному фоні)
 COL_INV_GREEN  = '\033[1;42m'   # Інверсний зелений жирний (на зеленому фоні)
 
-print("\033[H\033[J", end='')  # Переміщує курсор у верхній лівий кут і очищує екран
-
 # Рівні логування
 class LogLevel(Enum):
     CRITICAL = ("CRITICAL", COL_INV_RED)  # Інверсний червоний
@@ -38,23 +52,42 @@ class LogLevel(Enum):
 
     @classmethod
     def from_string(cls, level_str: str):
-        level = next(filter(lambda lvl: lvl.label == level_str, cls), None)
+        level = _LEVELS_BY_LABEL.get(level_str)
         if level is not None:
             return level
         raise ValueError("Невідомий рівень логування")
 
+# Пошук рівня за назвою за O(1) замість перебору всіх рівнів
+_LEVELS_BY_LABEL = {level.label: level for level in LogLevel}
+
+# Повідомлення про помилку читання файлу і завершення роботи
+def exit_on_file_error(file_path: str, error: Exception):
+    if isinstance(error, FileNotFoundError):
+        print(f"{COL_RED}❌ Файл {COL_YELLOW}{file_path}{COL_RED} не знайдено!{COL_RESET}")
+    else:
+        print(f"{COL_RED}❌ Невідома помилка:\n{error}{COL_RESET}")
+    sys.exit(0)
+
+# Потокове читання непорожніх рядків логу (файл не завантажується в пам'ять цілком, стиснений — розпаковується на льоту)
+def read_log_lines(file_path: str) -> Iterator[str]:
+    try:
+        with open_text(file_path) as file:
+            for line in file:
+                if line.strip():
+                    yield line
+    except Exception as e:
+        exit_on_file_error(file_path, e)
+
 # Завантаження логів із файлу
 def load_logs(file_path: str) -> List[str]:
+    return list(read_log_lines(file_path))
+
+# Завантаження логів у компактне колонкове сховище (mmap + масиви замість словників)
+def load_log_store(file_path: str, jobs: int = 1, since: int | None = None, until: int | None = None) -> LogStore:
     try:
-        with open(file_path, "r") as file:
-            lines = file.readlines()
-        return lines
-    except FileNotFoundError:
-        print(f"{COL_RED}❌ Файл {COL_YELLOW}{file_path}{COL_RED} не знайдено!{COL_RESET}")
-        sys.exit(0)
+        return LogStore.from_file(file_path, list(LogLevel), jobs=jobs, since=since, until=until)
     except Exception as e:
-        print(f"{COL_RED}❌ Невідома помилка:\n{e}{COL_RESET}")
-        sys.exit(0)
+        exit_on_file_error(file_path, e)
 
 # Парсинг окремого рядка логу
 def parse_log_line(line: str) -> dict:
@@ -71,100 +104,521 @@ def parse_log_line(line: str) -> dict:
 
     return {"timestamp": timestamp, "level": log_level, "description": description}
 
+# Потоковий парсинг: некоректні рядки повертаються як {"raw": ...}
+def parse_logs(lines: Iterable[str]) -> Iterator[Dict]:
+    for line in lines:
+        try:
+            yield parse_log_line(line)
+        except ValueError:
+            yield {"raw": line.strip()}
+
+# Ключ часу для злиття — те саме правило, що й у bisect_time: рядок, що починається з коректних
+# дати і часу (навіть якщо далі він некоректний), має власний час; рядок без часу отримує час
+# наступного такого рядка свого файлу, а некоректні рядки в кінці файлу — «нескінченність»
+END_OF_TIME = "\uffff"
+CLOCK_RE = re.compile(r"(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]\Z")  # Як перевірка часу в parse_timestamp
+
+def keyed_by_time(logs: Iterable[Dict]) -> Iterator[Tuple[str, Dict]]:
+    pending = []  # Некоректні рядки, що чекають на наступний запис з часом
+    # Час сусідніх рядків зазвичай однаковий, а дата — майже завжди: перевіряємо лише зміни
+    last_text, last_key = None, None
+    last_date, date_ok = None, False
+    for log in logs:
+        text = log.get("timestamp")
+        if text is None:
+            head = log["raw"].split(maxsplit=2)
+            text = f"{head[0]} {head[1]}" if len(head) >= 2 else None
+        if text != last_text:
+            last_text, last_key = text, None
+            if text is not None:
+                date, _, clock = text.partition(" ")
+                if date != last_date:
+                    last_date, date_ok = date, parse_timestamp(date.encode(), b"00:00:00") != NO_TIMESTAMP
+                # Формат дати і часу фіксованої ширини, тож коректний текст упорядковується так само, як epoch
+                if date_ok and CLOCK_RE.match(clock):
+                    last_key = text
+        if last_key is None:
+            pending.append(log)
+            continue
+        for waiting in pending:
+            yield last_key, waiting
+        pending.clear()
+        yield last_key, log
+    for waiting in pending:
+        yield END_OF_TIME, waiting
+
+# K-way злиття кількох упорядкованих за часом потоків записів. У пам'яті — по одному запису з кожного потоку;
+# записи з однаковим часом ідуть у порядку файлів. `since`/`until` (epoch, включно) — вікно часу
+def merge_logs(streams: Iterable[Iterable[Dict]], since: int | None = None, until: int | None = None) -> Iterator[Dict]:
+    low = format_timestamp(since) if since is not None else ""
+    high = format_timestamp(until) if until is not None else END_OF_TIME
+    for key, log in heapq.merge(*map(keyed_by_time, streams), key=operator.itemgetter(0)):
+        if low <= key <= high:
+            yield log
+
+# Шляхи до логів з аргументів: шаблони (*.log, app.log.*) розгортаються, повтори відкидаються
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.escape(pattern) != pattern else []
+        paths.extend(matches or [pattern])  # Без збігів — лишаємо як є, щоб показати помилку «не знайдено»
+    return list(dict.fromkeys(paths))
+
+# Один прохід по потоку записів: підрахунок рівнів і некоректних рядків.
+# Зберігаються лише записи, що проходять `keep` (без `keep` — жодного), тож статистика рахується в сталій пам'яті
+def analyze_logs(logs: Iterable[Dict], keep: Callable[[Dict], bool] | None = None) -> Tuple[Dict[LogLevel, int], int, Dict[int, Dict]]:
+    counter = collections.Counter()
+    incorrect_count = 0
+    kept_logs: Dict[int, Dict] = {}
+    for log in logs:
+        if "level" in log:
+            counter[log["level"]] += 1
+        else:
+            incorrect_count += 1
+        if keep is not None and keep(log):
+            kept_logs[len(kept_logs)] = log
+    return dict(counter), incorrect_count, kept_logs
+
 # Фільтрація логів за рівнями
-def filter_logs_by_level(logs: Dict[int, Dict], levels: Set[LogLevel]) -> Dict[int, Dict]:
+def filter_logs_by_level(logs: Dict[int, Dict] | LogStore, levels: Set[LogLevel]) -> Dict[int, Dict] | LogStore:
+    if isinstance(logs, LogStore):
+        return logs.select_levels(levels)
     return {new_index: log for new_index, log in enumerate(log for log in logs.values() if "level" in log and log["level"] in levels)}
 
+# Форматування одного запису з кольорами (None — некоректний запис, який не показуємо)
+def format_log_entry(logs: Dict[int, Dict] | LogStore, index: int, include_invalid: bool = False) -> str | None:
+    if isinstance(logs, LogStore):
+        # Рядки сховища читаються напряму з колонок, без проміжних словників
+        level = logs.level(index)
+        if level is not None:
+            return f"{logs.timestamp(index)} {level.color}{level.label:5}{COL_RESET} {logs.description(index)}\033[K"
+        if include_invalid:
+            return f"{COL_RED}!Некоректний запис!{COL_GRAY} : — : {COL_YELLOW}{logs.raw(index)}\033[K{COL_RESET}"
+        return None
+    log = logs[index]
+    if "level" in log:
+        level : LogLevel = log["level"]
+        return f"{log['timestamp']} {level.color}{level.label:5}{COL_RESET} {log['description']}\033[K"
+    if include_invalid:
+        return f"{COL_RED}!Некоректний запис!{COL_GRAY} : — : {COL_YELLOW}{log['raw']}\033[K{COL_RESET}"
+    return None
+
 # Обгортка для форматування логів з кольорами
-def format_logs_with_colors(logs: Dict[int, Dict], include_invalid: bool = False) -> Dict[int, str]:
+def format_logs_with_colors(logs: Dict[int, Dict] | LogStore, include_invalid: bool = False) -> Dict[int, str]:
     formatted_logs = {}
-    for index, log in logs.items():
-        if "level" in log:
-            level : LogLevel = log["level"]
-            formatted_logs[index] = f"{log['timestamp']} {level.color}{level.label:5}{COL_RESET} {log['description']}\033[K"
-        elif include_invalid:
-            formatted_logs[index] = f"{COL_RED}!Некоректний запис!{COL_GRAY} : — : {COL_YELLOW}{log['raw']}\033[K{COL_RESET}"
+    for index in logs.keys():
+        formatted = format_log_entry(logs, index, include_invalid)
+        if formatted is not None:
+            formatted_logs[index] = formatted
     return formatted_logs
 
+# Ліниве джерело рядків для переглядача: форматує запис лише тоді, коли він потрапляє на екран
+class LazyFormattedLogs:
+    def __init__(self, logs: Dict[int, Dict] | LogStore, include_invalid: bool = False, cache_size: int | None = None,
+                 profiler=NULL_PROFILER):
+        if include_invalid:
+            self._keys = None  # Видно всі записи — індекси збігаються
+        elif isinstance(logs, LogStore):
+            if logs.counts()[1]:
+                logs = logs.select(i for i in range(len(logs)) if logs.level(i) is not None)
+            self._keys = None
+        else:
+            self._keys = [index for index, log in logs.items() if "level" in log]
+        self._logs = logs
+        self._include_invalid = include_invalid
+        # Невеликий кеш нещодавно показаних рядків, щоб прокручування вперед-назад не форматувало їх заново
+        self._cache: collections.OrderedDict[int, str] = collections.OrderedDict()
+        self._cache_size = cache_size or 4 * view.MAX_ROWS_ON_SCREEN
+        self._profiler = profiler
+
+    def __len__(self) -> int:
+        return len(self._logs) if self._keys is None else len(self._keys)
+
+    def plain(self, row: int) -> str:
+        """Текст запису без кольорів і часу — для пошуку (кеш форматованих рядків не використовується)"""
+        index = row if self._keys is None else self._keys[row]
+        if isinstance(self._logs, LogStore):
+            return self._logs.description(index) if self._logs.level(index) is not None else self._logs.raw(index)
+        log = self._logs[index]
+        return log.get("description", log.get("raw", ""))
+
+    def __getitem__(self, row: int) -> str:
+        formatted = self._cache.get(row)
+        if formatted is not None:
+            self._cache.move_to_end(row)
+            return formatted
+        if not 0 <= row < len(self):
+            raise KeyError(row)
+        index = row if self._keys is None else self._keys[row]
+        with self._profiler.stage("format") as record:
+            formatted = format_log_entry(self._logs, index, self._include_invalid)
+            record.lines += 1
+        self._cache[row] = formatted
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return formatted
+
 # Підрахунок кількості логів за рівнями
-def count_logs_by_level(logs: Dict[int, Dict]) -> Dict[LogLevel, int]:
+def count_logs_by_level(logs: Dict[int, Dict] | LogStore) -> Dict[LogLevel, int]:
+    if isinstance(logs, LogStore):
+        return logs.counts()[0]
     counter = collections.Counter(log["level"] for log in logs.values() if "level" in log and isinstance(log["level"], LogLevel))
     return dict(counter)
 
-# Виведення статистики
-def display_log_counts(counts: Dict[LogLevel, int]):
-    print("╔══════════════════╤═══════════╗")
-    print("║ Рівень логування │ Кількість ║")
-    print("╟──────────────────┼───────────╢")
+# Таблиця статистики як рядок (для друку або перемальовування на місці)
+def render_log_counts(counts: Dict[LogLevel, int]) -> str:
+    lines = ["╔══════════════════╤═══════════╗",
+             "║ Рівень логування │ Кількість ║",
+             "╟──────────────────┼───────────╢"]
 
     # Сортуємо рівні за порядком у LogLevel
     sorted_levels = [lvl for lvl in LogLevel if lvl in counts]
-    
+
     for level in sorted_levels:
         count = counts[level]
-        print(f"║ {level.color}{level.label:<16}{COL_RESET} │ {level.color}{count:<9}{COL_RESET} ║")
+        lines.append(f"║ {level.color}{level.label:<16}{COL_RESET} │ {level.color}{count:<9}{COL_RESET} ║")
 
-    print("╚══════════════════╧═══════════╝")
+    lines.append("╚══════════════════╧═══════════╝")
+    return "\n".join(lines)
+
+# Таблиця --histogram: кількість записів кожного рівня за інтервалами і найчастіші описи під кожним рядком
+def render_histogram(histogram: TimeHistogram) -> str:
+    rows = histogram.rows()
+    levels = [lvl for lvl in LogLevel if any(lvl in counts for _, counts, _ in rows)]
+    widths = [max(len(level.label), 5) for level in levels]
+    cells = [f"{'Інтервал':<19}", *(f"{level.label:>{w}}" for level, w in zip(levels, widths)), f"{'Разом':>7}"]
+    inner = len(" │ ".join(cells))
+    lines = [f"╔═{'═╤═'.join('═' * len(cell) for cell in cells)}═╗",
+             f"║ {' │ '.join(cells)} ║",
+             f"╟─{'─┼─'.join('─' * len(cell) for cell in cells)}─╢"]
+    for bucket, counts, top in rows:
+        row = [f"{format_timestamp(bucket):<19}",
+               *(f"{level.color}{counts.get(level, 0) or '·':>{w}}{COL_RESET}" for level, w in zip(levels, widths)),
+               f"{sum(counts.values()):>7}"]
+        lines.append(f"║ {' │ '.join(row)} ║")
+        for description, n in top:
+            text = f"   {n:>6}× {description}"
+            text = text[:inner - 1] + "…" if len(text) > inner else f"{text:<{inner}}"
+            lines.append(f"║ {COL_GRAY}{text}{COL_RESET} ║")
+    lines.append(f"╚═{'═╧═'.join('═' * len(cell) for cell in cells)}═╝")
+    return "\n".join(lines)
+
+# Виведення статистики
+def display_log_counts(counts: Dict[LogLevel, int]):
+    print(render_log_counts(counts))
+
+# Режим --follow: стежимо за файлом і перемальовуємо статистику та останні рядки на місці
+async def follow_logs(file_path: str, levels: Set[LogLevel] | None, show_all: bool, refresh: float = 0.25):
+    counts: collections.Counter = collections.Counter()
+    incorrect_count = 0
+    rows = collections.deque(maxlen=view.MAX_ROWS_ON_SCREEN)
+    follower = LogFollower(file_path)
+    dirty = asyncio.Event()
+
+    async def reader():
+        nonlocal incorrect_count
+        async for chunk in follower.chunks():
+            # Кожен блок нових рядків розбирається одним проходом без копіювання рядків
+            store = LogStore(chunk, list(LogLevel))
+            store.parse_range(0, len(chunk))
+            chunk_counts, chunk_incorrect = store.counts()
+            counts.update(chunk_counts)
+            incorrect_count += chunk_incorrect
+            if show_all or levels:
+                visible = store if show_all else store.select_levels(levels)
+                # Форматуємо лише ті рядки, що потраплять на екран
+                tail = visible.select(range(max(0, len(visible) - rows.maxlen), len(visible)))
+                rows.extend(format_logs_with_colors(tail, include_invalid=show_all).values())
+            dirty.set()
+
+    async def painter():
+        while True:
+            await dirty.wait()
+            dirty.clear()
+            frame = ["\033[H" + render_log_counts(dict(counts)).replace("\n", "\033[K\n") + "\033[K"]
+            if incorrect_count:
+                frame.append(f"{COL_INV_YELLOW} Увага! Файл містить некоректні рядки. Кількість: {incorrect_count} шт. {COL_RESET}\033[K")
+            status = f"Стежимо за {file_path} (Ctrl+C — вихід)"
+            if follower.rotations or follower.truncations:
+                status += f" · ротацій: {follower.rotations}, обрізань: {follower.truncations}"
+            frame.append(f"\n{COL_INV_GREEN} {status} {COL_RESET}\033[K")
+            frame.extend(rows)
+            sys.stdout.write("\n".join(frame) + "\033[J")
+            sys.stdout.flush()
+            await asyncio.sleep(refresh)  # Обмежуємо частоту перемальовування
+
+    reader_task = asyncio.ensure_future(reader())
+    painter_task = asyncio.ensure_future(painter())
+    try:
+        await reader_task
+    finally:
+        painter_task.cancel()
+
+# Значення опції командного рядка: усі аргументи після неї до наступної опції
+def option_values(args: List[str], *names: str) -> List[str] | None:
+    for name in names:
+        if name in args:
+            values = []
+            for arg in args[args.index(name) + 1:]:
+                if arg.startswith("-"):
+                    break
+                values.append(arg)
+            return values
+    return None
+
+# Кількість процесів для --jobs N (без опції — 1, без числа — усі ядра)
+def parse_jobs(args: List[str]) -> int:
+    values = option_values(args, "--jobs", "-j")
+    if values is None:
+        return 1
+    if not values:
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(values[0]))
+    except ValueError:
+        print(f"{COL_RED}Помилка: після '--jobs' має йти кількість процесів{COL_RESET}")
+        sys.exit(1)
+
+# Час для --since/--until: "2025-03-19 18:40[:00]", "2025-03-19T18:40:00", "2025-03-19" або відносно зараз: "5m", "2h", "1d"
+TIME_ARG_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_time_arg(args: List[str], name: str) -> int | None:
+    values = option_values(args, name)
+    if values is None:
+        return None
+    value = " ".join(values)
+    if match := re.fullmatch(r"(\d+)([smhd])", value):
+        # Час у логах — локальний, тому "зараз" беремо як локальний час у тій самій шкалі
+        return calendar.timegm(time.localtime()) - int(match.group(1)) * DURATION_UNITS[match.group(2)]
+    for fmt in TIME_ARG_FORMATS:
+        try:
+            return calendar.timegm(datetime.strptime(value, fmt).timetuple())
+        except ValueError:
+            continue
+    print(f"{COL_RED}Помилка: некоректний час '{value}' після '{name}'{COL_RESET}")
+    sys.exit(1)
+
+# Інтервал для --histogram: "30s", "15m", "1h", "1d" (без значення — хвилина)
+def parse_interval(args: List[str]) -> int | None:
+    values = option_values(args, "--histogram")
+    if values is None:
+        return None
+    if not values:
+        return DURATION_UNITS["m"]
+    match = re.fullmatch(r"(\d*)([smhd])", values[0])
+    if match is None or match.group(1) and int(match.group(1)) == 0:
+        print(f"{COL_RED}Помилка: некоректний інтервал '{values[0]}' після '--histogram' (приклади: 1m, 15m, 1h){COL_RESET}")
+        sys.exit(1)
+    return int(match.group(1) or 1) * DURATION_UNITS[match.group(2)]
+
+# Кількість найчастіших описів у кожному інтервалі (--top N)
+def parse_top(args: List[str]) -> int:
+    values = option_values(args, "--top")
+    try:
+        return 3 if not values else max(0, int(values[0]))
+    except ValueError:
+        print(f"{COL_RED}Помилка: після '--top' має йти число{COL_RESET}")
+        sys.exit(1)
+
+# Збереження --histogram у файл: формат визначається розширенням (.csv або .json)
+def save_histogram(histogram: TimeHistogram, output_path: str):
+    if output_path.lower().endswith(".json"):
+        data = histogram.to_json()
+    elif output_path.lower().endswith(".csv"):
+        data = histogram.to_csv()
+    else:
+        print(f"{COL_RED}Помилка: файл для '--output' має бути .csv або .json{COL_RESET}")
+        sys.exit(1)
+    with open(output_path, "w", encoding="utf-8", newline="") as file:
+        file.write(data)
+    print(f"{COL_GREEN}Гістограму збережено у {output_path}{COL_RESET}")
+
+# Підсумок --profile: таблиця в консоль або JSON у файл; з --cprofile — ще й статистика cProfile
+def finish_profile(profiler: StageProfiler, output_path: str | None, cprofile: cProfile.Profile | None, cprofile_path: str | None):
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(cprofile_path)
+        print(f"{COL_GREEN}Статистику cProfile збережено у {cprofile_path} (перегляд: python -m pstats {cprofile_path}){COL_RESET}")
+    if profiler is NULL_PROFILER:
+        return
+    profiler.stop()
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as file:
+            file.write(profiler.to_json())
+        print(f"{COL_GREEN}Профіль етапів збережено у {output_path}{COL_RESET}")
+    else:
+        print(f"\n{COL_INV_GREEN} Профіль етапів (час — власний, без вкладених етапів; з увімкненим tracemalloc): {COL_RESET}")
+        print(profiler.render())
 
 def main():
+    print("\033[H\033[J", end='')  # Переміщує курсор у верхній лівий кут і очищує екран
     args = sys.argv[1:]
     if not args:
         args = R"task3\logfile.log --all".split()  # Для тестування в VSCode
 
     if not args or "--help" in args or "-h" in args:
         print(f"╔{'═' * 65}╗")
-        print(f"║  {COL_GREEN}Використання: python t3.py <file.log> [--all | --level LEVEL]  {COL_RESET}║")
+        print(f"║  {COL_GREEN}Використання: python t3.py <file.log>... [--all|--level LEVEL] {COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--jobs N] [--no-index]':<25}{COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--follow]':<25}{COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--since T] [--until T]':<25}{COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--histogram I] [--top N]':<25}{COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--output FILE.csv|.json]':<25}{COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--profile [FILE.json]]':<25}{COL_RESET}║")
+        print(f"║  {COL_GREEN}{' ' * 38}{'[--cprofile FILE.prof]':<25}{COL_RESET}║")
         print(f"║  {COL_YELLOW}Приклад:{COL_RESET} python t3.py logfile.log --level ERROR')              {COL_RESET}║")
         print(f"╚{'═' * 65}╝")
         sys.exit()
 
-    file_path = args[0]
-    logs_raw = [line for line in load_logs(file_path) if line.strip()]
+    # Усі аргументи до першої опції — файли або шаблони шляхів
+    first_option = next((i for i, arg in enumerate(args) if arg.startswith("-")), len(args))
+    paths = expand_paths(arg for arg in args[:first_option] if arg != "ALL")
+    file_path = paths[0] if paths else args[0]
+    show_all = any(arg in args for arg in ["--all", "-a", "ALL"])
+    jobs = parse_jobs(args)
+    since, until = parse_time_arg(args, "--since"), parse_time_arg(args, "--until")
+    window = since is not None or until is not None
+    interval = parse_interval(args)
+    histogram = TimeHistogram(list(LogLevel), interval, parse_top(args)) if interval else None
+    output_path = (option_values(args, "--output") or [None])[0]
 
-    parsed_logs : dict[int,str] = {}
-    incorrect_count = 0
+    # Профілювання етапів лише з --profile; без нього етапи не обгортаються (NULL_PROFILER)
+    profile_values = option_values(args, "--profile")
+    profiler = StageProfiler().start() if profile_values is not None else NULL_PROFILER
+    cprofile_path = (option_values(args, "--cprofile") or [None])[0]
+    cprofile = cProfile.Profile() if cprofile_path else None
+    if cprofile is not None:
+        cprofile.enable()
+    compressed = detect_format(file_path) is not None  # .gz/.bz2/.xz розпаковуються на льоту
 
-    for idx, line in enumerate(logs_raw):
+    # Рівні для фільтра розбираємо заздалегідь, щоб відфільтрувати записи під час того ж проходу
+    levels, level_strs = None, []
+    if not show_all and "--level" in args:
+        level_strs = [level_str.upper() for level_str in option_values(args, "--level")]
         try:
-            parsed_logs[idx] = parse_log_line(line)
+            levels = {LogLevel.from_string(level_str) for level_str in level_strs}
         except ValueError:
-            parsed_logs[idx] = {"raw": line.strip()}
-            incorrect_count += 1
+            levels = None
+
+    if "--follow" in args or "-f" in args:
+        if len(paths) > 1:
+            print(f"{COL_RED}Помилка: стежити можна лише за одним файлом{COL_RESET}")
+            sys.exit(1)
+        if compressed:
+            print(f"{COL_RED}Помилка: стежити можна лише за нестисненим файлом{COL_RESET}")
+            sys.exit(1)
+        if "--level" in args and levels is None:
+            print(f"{COL_RED}Помилка: невідомий або не вказаний рівень логування після '--level'{COL_RESET}")
+            sys.exit(1)
+        # Стеження завершується через Ctrl+C або помилку — профіль зберігаємо в будь-якому разі
+        try:
+            with profiler.stage("follow"):
+                asyncio.run(follow_logs(file_path, levels, show_all))
+        except KeyboardInterrupt:
+            print(COL_RESET)
+        except Exception as e:
+            exit_on_file_error(file_path, e)
+        finally:
+            finish_profile(profiler, (profile_values or [None])[0], cprofile, cprofile_path)
+        return
 
-    counts = count_logs_by_level(parsed_logs)
+    # Індекс поруч із логом: для --level будується автоматично, для статистики — використовується, якщо вже є.
+    # Стиснені архіви не індексуються: зсуви в індексі мають сенс лише для файлу, відображеного в пам'ять
+    use_index = "--no-index" not in args and not show_all and not window and not histogram and not compressed \
+        and len(paths) == 1 \
+        and (levels or os.path.exists(index_path(file_path)))
+
+    if len(paths) > 1:
+        # Кілька файлів: потокове злиття за часом, зберігаються лише записи для перегляду
+        keep = (lambda log: True) if show_all else (lambda log: log.get("level") in levels) if levels else None
+        streams = (profiler.iterate("parse", parse_logs(profiler.iterate("read", read_log_lines(path)))) for path in paths)
+        logs = profiler.iterate("merge", merge_logs(streams, since, until))
+        if histogram:
+            logs = profiler.iterate("histogram", histogram.feed(logs))
+        with profiler.stage("count") as record:
+            counts, incorrect_count, kept_logs = analyze_logs(logs, keep)
+            record.lines = sum(counts.values()) + incorrect_count
+    elif use_index:
+        try:
+            with profiler.stage("index") as record:
+                index = load_index(file_path, list(LogLevel), jobs)
+                counts, incorrect_count = index.counts()
+                record.lines = sum(counts.values()) + incorrect_count
+        except Exception as e:
+            exit_on_file_error(file_path, e)
+        with profiler.stage("select") as record:
+            kept_logs = index.select(levels) if levels else {}
+            record.lines = len(kept_logs)
+    elif show_all or levels or window or histogram:
+        # Для перегляду записи потрібні — тримаємо їх у компактному сховищі.
+        # З --since/--until розбираються лише рядки всередині вікна часу
+        with profiler.stage("load") as record:
+            store = load_log_store(file_path, jobs, since, until)
+            record.lines = len(store)
+        with profiler.stage("count") as record:
+            counts, incorrect_count = store.counts()
+            record.lines = len(store)
+        if histogram:
+            with profiler.stage("histogram") as record:
+                histogram.add_store(store)
+                record.lines = len(store)
+        with profiler.stage("filter") as record:
+            kept_logs = store if show_all else filter_logs_by_level(store, levels) if levels else {}
+            record.lines = len(store)
+    elif jobs > 1 and not compressed:
+        # Лише статистика, паралельно: процеси повертають тільки лічильники
+        try:
+            with profiler.stage("count") as record:
+                counts, incorrect_count = count_file(file_path, list(LogLevel), jobs)
+                record.lines = sum(counts.values()) + incorrect_count
+        except Exception as e:
+            exit_on_file_error(file_path, e)
+        kept_logs = {}
+    else:
+        # Лише статистика — записи не зберігаються
+        with profiler.stage("count") as record:
+            logs = profiler.iterate("parse", parse_logs(profiler.iterate("read", read_log_lines(file_path))))
+            counts, incorrect_count, kept_logs = analyze_logs(logs)
+            record.lines = sum(counts.values()) + incorrect_count
     display_log_counts(counts)
 
     if incorrect_count:
         print(f"{COL_INV_YELLOW} Увага! Файл містить некоректні рядки. Кількість: {incorrect_count} шт. {COL_RESET}")
 
-    if any(arg in args for arg in ["--all", "-a", "ALL"]):
-        print(f"\n{COL_INV_GREEN} Деталі логів (всі записи файлу): {COL_RESET}")
-        filtered_logs = format_logs_with_colors(parsed_logs, include_invalid=True)
+    if histogram:
+        print(f"\n{COL_INV_GREEN} Розподіл за часом (інтервал {interval} с): {COL_RESET}")
+        print(render_histogram(histogram))
+        if output_path:
+            save_histogram(histogram, output_path)
+
+    if show_all:
+        print(f"\n{COL_INV_GREEN} Деталі логів (всі записи {'файлу' if len(paths) <= 1 else f'{len(paths)} файлів'}): {COL_RESET}")
+        filtered_logs = LazyFormattedLogs(kept_logs, include_invalid=True, profiler=profiler)
 
         # ====ІНТЕРАКТИВНИЙ ВИВІД В КОНСОЛЬ (СКРОЛІНГ КЛАВІАТУРОЮ)=====
-        view.view_interactive_log(filtered_logs)
+        with profiler.stage("view") as record:
+            view.view_interactive_log(filtered_logs)
+            record.lines = len(filtered_logs)
         # =============================================================
     elif "--level" in args:
-        level_index = args.index("--level") + 1
-        if level_index < len(args):
-            level_strs = map(str.upper, args[level_index:])
-            try:
-                levels = {LogLevel.from_string(level_str) for level_str in level_strs}
-                # Фільтрація логів по типам
-                filtered_logs = filter_logs_by_level(parsed_logs, levels)
-                print(f"\n{COL_INV_GREEN} Рівні: {', '.join(level.label for level in levels)}. Деталі логів: {COL_RESET}")
-                # Мапінг логів: перетворення значення внутрішнього словника на кольоровий рядок
-                filtered_logs = format_logs_with_colors(filtered_logs)
-
-                # ІНТЕРАКТИВНИЙ ВИВІД В КОНСОЛЬ (СКРОЛІНГ КЛАВІАТУРОЮ)
-                view.view_interactive_log(filtered_logs)
-                # ====================================================
-            except ValueError:
-                print(f"{COL_RED}Помилка: невідомий рівень логування в списку '{', '.join(level_strs)}'{COL_RESET}")
-                sys.exit(1)
-        else:
+        if not level_strs:
             print(f"{COL_RED}Помилка: рівень логування не вказано після '--level'{COL_RESET}")
             sys.exit(1)
+        if levels is None:
+            print(f"{COL_RED}Помилка: невідомий рівень логування в списку '{', '.join(level_strs)}'{COL_RESET}")
+            sys.exit(1)
+        print(f"\n{COL_INV_GREEN} Рівні: {', '.join(level.label for level in levels)}. Деталі логів: {COL_RESET}")
+        # Мапінг логів: перетворення запису на кольоровий рядок — ліниво, лише для видимих рядків
+        filtered_logs = LazyFormattedLogs(kept_logs, profiler=profiler)
+
+        # ІНТЕРАКТИВНИЙ ВИВІД В КОНСОЛЬ (СКРОЛІНГ КЛАВІАТУРОЮ)
+        with profiler.stage("view") as record:
+            view.view_interactive_log(filtered_logs)
+            record.lines = len(filtered_logs)
+        # ====================================================
+
+    finish_profile(profiler, (profile_values or [None])[0], cprofile, cprofile_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,9 @@
 import os
 import shutil
+import sys
+import time
+
+from search import ANSI_RE, SearchIndex, highlight
 
 # Константи кольорів (ANSI-коди):
 COL_RESET  = '\033[0m'    # Стандартний колір
@@ -31,11 +35,117 @@ cols, rows = get_terminal_size()
 # Максимальна кількість рядків логів, що одночасно відображаються
 MAX_ROWS_ON_SCREEN = min(24, max(rows - 4, 5)) # Розмір блоку виводу залежить від розміру консолі, але не більше 20 рядків
 
-def view_interactive_log(logs: dict[int:str]):
+class FrameRenderer:
+    """
+    Диференційне перемальовування блоку рядків у терміналі.
+    Порівнює новий кадр з попереднім і переписує лише змінені рядки, а весь кадр виводить одним записом.
+    Зсув перегляду на один рядок виконується прокручуванням області (scroll region) терміналу,
+    якщо відомий абсолютний рядок початку блоку (`top_row`). Час кожного кадру зберігається в `frame_times`.
+    """
+
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.prev: list[str] | None = None  # Попередній кадр (рядки без символу нового рядка)
+        self.top_row: int | None = None     # Абсолютний номер першого рядка блоку (з 1), якщо відомий
+        self.frame_times: list[float] = []
+
+    def render(self, lines: list[str], scroll: int = 0, scroll_rows: int = 0):
+        """
+        Виводить кадр `lines`. Курсор до і після виклику стоїть на рядку під блоком.
+        `scroll` = ±1 — перегляд зсунувся на рядок; перші `scroll_rows` рядків кадру прокручуються терміналом.
+        """
+        started = time.perf_counter()
+        buf = []
+        prev = self.prev
+        if prev is None or len(prev) != len(lines):
+            buf.extend(f"\r{line}\033[K\n" for line in lines)
+        else:
+            if scroll in (-1, 1) and self.top_row is not None and scroll_rows > 1:
+                top, bottom = self.top_row, self.top_row + scroll_rows - 1
+                # Зберігаємо курсор, обмежуємо прокручування областю рядків логу і зсуваємо її на рядок
+                buf.append(f"\0337\033[{top};{bottom}r")
+                if scroll > 0:
+                    buf.append(f"\033[{bottom};1H\n")
+                    prev = prev[1:scroll_rows] + [None] + prev[scroll_rows:]
+                else:
+                    buf.append(f"\033[{top};1H\033M")
+                    prev = [None] + prev[:scroll_rows - 1] + prev[scroll_rows:]
+                buf.append("\033[r\0338")
+            # Курсор під блоком; рухаємося вгору до першого зміненого рядка і далі лише вниз
+            cursor = len(lines)
+            for i, line in enumerate(lines):
+                if prev[i] == line:
+                    continue
+                if cursor > i:
+                    buf.append(f"\033[{cursor - i}A")
+                elif i > cursor:
+                    buf.append(f"\033[{i - cursor}B")
+                buf.append(f"\r{line}\033[K")
+                cursor = i
+            if cursor < len(lines):
+                buf.append(f"\033[{len(lines) - cursor}B\r")
+        self.out.write("".join(buf))
+        self.out.flush()
+        self.prev = list(lines)
+        self.frame_times.append(time.perf_counter() - started)
+
+    @property
+    def last_frame_ms(self) -> float:
+        return self.frame_times[-1] * 1000 if self.frame_times else 0.0
+
+    def summary(self) -> str:
+        if not self.frame_times:
+            return ""
+        avg = sum(self.frame_times) / len(self.frame_times) * 1000
+        return f"Кадрів: {len(self.frame_times)}, середній час: {avg:.2f} мс, найдовший: {max(self.frame_times) * 1000:.2f} мс"
+
+def query_cursor_row(fd: int, timeout: float = 0.2) -> int | None:
+    """Запитує в терміналу (DSR) поточний рядок курсора. Лише для Unix у режимі cbreak"""
+    import select
+    sys.stdout.write("\033[6n")
+    sys.stdout.flush()
+    response = b""
+    while select.select([fd], [], [], timeout)[0]:
+        response += os.read(fd, 32)
+        if response.endswith(b"R"):
+            break
+    start = response.rfind(b"\033[")
+    try:
+        return int(response[start + 2:].split(b";")[0]) if start != -1 else None
+    except ValueError:
+        return None
+
+def read_key_unix(fd: int) -> str:
+    """Читає одну клавішу з терміналу в режимі cbreak і повертає її назву"""
+    import select
+    data = os.read(fd, 1)
+    if data in (b"\n", b"\r"):
+        return "enter"
+    if data in (b"\x7f", b"\x08"):
+        return "backspace"
+    if data != b"\x1b":
+        # Багатобайтовий символ UTF-8 дочитуємо повністю
+        while data[0] >= 0xC0 and len(data) < 4:
+            try:
+                return data.decode()
+            except UnicodeDecodeError:
+                data += os.read(fd, 1)
+        return data.decode(errors="ignore")
+    # Після Esc одразу йде решта escape-послідовності; окремий Esc — вихід
+    while select.select([fd], [], [], 0.03)[0]:
+        data += os.read(fd, 8)
+    return {b"\x1b": "esc", b"\x1b[A": "up", b"\x1b[B": "down",
+            b"\x1b[5~": "pgup", b"\x1b[6~": "pgdn"}.get(data, "")
+
+def view_interactive_log(logs):
     """
     Відображає інтерфейс скролінгу логів у терміналі.
+    `logs` — будь-яке джерело з `len()` та доступом за індексом `logs[i]`
+    (словник або ліниве джерело, що форматує рядки лише під час показу).
     """
+    global current_start
     total_logs = len(logs)
+    current_start = 0
 
     if total_logs == 0:
         print("═" * 120)
@@ -43,38 +153,111 @@ def view_interactive_log(logs: dict[int:str]):
         print("═" * 120)
         return
 
-    print(f"╒{"═" * 4}╡{COL_GRAY} Керування: стрілки ↑↓ / PgUp PgDn / Esc для виходу {COL_RESET}╞{"═" * (cols - 61)}╕")
+    print(f"╒{"═" * 4}╡{COL_GRAY} Керування: стрілки ↑↓ / PgUp PgDn / пошук / n N / Esc для виходу {COL_RESET}╞{"═" * (cols - 75)}╕")
+
+    visible_rows = min(MAX_ROWS_ON_SCREEN, total_logs)
+    max_start = total_logs - visible_rows
+    renderer = FrameRenderer()
+    previous_start = None
+
+    # Пошук: індекс за простим текстом рядків (без ANSI-кольорів) починає будуватися у фоні після першого `/`
+    plain = getattr(logs, "plain", None) or (lambda i: ANSI_RE.sub("", logs[i]))
+    index = SearchIndex(total_logs, plain)
+    search = {"typing": False, "query": "", "current": None, "anchor": 0}
 
-    def draw_screen(start=MAX_ROWS_ON_SCREEN+1):
-        # Переміщення курсора у верхню ліву точку для оновлення екрану
-        print(f"\r{'\033[A' * start}", end='')
-        minimum = min(current_start + MAX_ROWS_ON_SCREEN, total_logs)
-        for i in range(current_start, minimum):
+    def build_frame() -> list[str]:
+        # Позиція повзунка на скрол-барі рахується один раз на кадр
+        scroll_pos = round((current_start / max_start) * (visible_rows - 3)) + 1 if max_start else -1
+        frame = []
+        for row in range(visible_rows):
             # Визначення символів скрол-бару:
-            if i - current_start == 0:
+            if row == scroll_pos:
+                sb = SCROLL_BAR_CUR     # Повзунок скрол-бару
+            elif row == 0:
                 sb = SCROLL_ARROW_UP    # Верхня стрілка
-            elif i - current_start == MAX_ROWS_ON_SCREEN - 1:
+            elif row == visible_rows - 1:
                 sb = SCROLL_ARROW_DN    # Нижня стрілка
             else:
                 sb = SCROLL_BAR_EMPTY   # Порожнє місце на скрол-барі
+            line = logs[current_start + row]
+            if search["query"]:
+                line = highlight(line, search["query"])
+            frame.append(f"{sb} {line}")
 
-            # Позиція повзунка на скрол-барі:
-            scroll_pos = round((current_start / (total_logs - MAX_ROWS_ON_SCREEN)) * (MAX_ROWS_ON_SCREEN - 3)) + 1
-            if i - current_start == scroll_pos:
-                sb = SCROLL_BAR_CUR     # Повзунок скрол-бару
+        # Вивід інформації про поточну позицію перегляду логів, пошуку і часу попереднього кадру
+        pos = f"{current_start+1}-{current_start + visible_rows} з {total_logs}"
+        timing = f" {renderer.last_frame_ms:5.2f} мс "
+        footer = f"╘{"═" * 4}╡ {COL_CYAN}{pos:^20}{COL_RESET}╞"
+        if search["typing"] or search["query"]:
+            status = f"/{search['query']}{'▏' if search['typing'] else ''}"
+            if search["current"] is not None:
+                status += f"  → рядок {search['current'] + 1}"
+            elif search["query"]:
+                status += "  немає збігів"
+            if index.started and not index.ready.is_set():
+                status += f"  (індексація {index.progress * 100 // total_logs}%)"
+            footer += f" {COL_YELLOW}{status}{COL_RESET} ╞"
+        fill = cols - 2 - len(ANSI_RE.sub("", footer)) - len(timing)
+        frame.append(f"{footer}{"═" * max(fill, 0)}╡{COL_GRAY}{timing}{COL_RESET}╛")
+        return frame
+
+    def draw_screen():
+        nonlocal previous_start
+        shift = current_start - previous_start if previous_start is not None else 0
+        renderer.render(build_frame(), scroll=shift, scroll_rows=visible_rows)
+        previous_start = current_start
+
+    def show_match(row: int | None):
+        global current_start
+        search["current"] = row
+        if row is not None:
+            current_start = min(row, max_start)
+
+    def update_search():
+        # Інкрементальний пошук: після кожної зміни запиту переходимо до першого збігу від місця початку пошуку
+        show_match(index.next_match(search["query"], search["anchor"] - 1))
 
-            print(f"{sb} {logs[i]}")
+    def handle_key(key: str) -> bool:
+        """Обробляє клавішу; повертає False, якщо треба вийти з переглядача"""
+        if search["typing"]:
+            if key == "enter":
+                search["typing"] = False
+            elif key == "esc":
+                search.update(typing=False, query="", current=None)
+            elif key == "backspace":
+                search["query"] = search["query"][:-1]
+                update_search()
+            elif len(key) == 1 and key.isprintable():
+                search["query"] += key
+                update_search()
+            return True
+        if key == "esc":
+            return False
+        if key == "/":
+            index.start()
+            search.update(typing=True, query="", current=None, anchor=current_start)
+        elif key in ("n", "N") and search["query"]:
+            row = search["current"] if search["current"] is not None else current_start
+            show_match(index.next_match(search["query"], row, forward=key == "n"))
+        else:
+            move(key)
+        return True
 
-        # Вивід інформації про поточну позицію перегляду логів
-        pos = f"{current_start+1}-{min(current_start + MAX_ROWS_ON_SCREEN, total_logs)} з {total_logs}"
-        print(f"╘{"═" * 4}╡ {COL_CYAN}{pos:^20}{COL_RESET}╞{"═"*(cols - 30)}╛")
+    def move(key: str):
+        global current_start
+        if key == "up":
+            current_start = max(0, current_start - 1)
+        elif key == "down":
+            current_start = min(max_start, current_start + 1)
+        elif key == "pgup":
+            current_start = max(0, current_start - MAX_ROWS_ON_SCREEN)
+        elif key == "pgdn":
+            current_start = min(max_start, current_start + MAX_ROWS_ON_SCREEN)
 
     def interactive_win():
         import msvcrt  # Для перехоплення клавіатури (під Windows)
         import ctypes
 
-        global current_start
-
         # Приховуємо курсор у консолі
         handle = ctypes.windll.kernel32.GetStdHandle(-11)
         class CONSOLE_CURSOR_INFO(ctypes.Structure):
@@ -84,55 +267,49 @@ def view_interactive_log(logs: dict[int:str]):
         cursor_info.bVisible = False
         ctypes.windll.kernel32.SetConsoleCursorInfo(handle, ctypes.byref(cursor_info))
 
-        draw_screen(0)
+        special = {'H': "up", 'P': "down", '\x49': "pgup", '\x51': "pgdn"}
+        named = {'\x1b': "esc", '\r': "enter", '\x08': "backspace"}
+        draw_screen()
         while True:
-            key = msvcrt.getch()
-            
-            if key == b'\x1b':  # Esc
+            key = msvcrt.getwch()
+            if key in ('\x00', '\xe0'):  # Службові клавіші (стрілки, PgUp, PgDn) йдуть двома кодами
+                key = special.get(msvcrt.getwch(), "")
+            if not handle_key(named.get(key, key)):
                 break
-            elif key == b'H':  # Стрілка вгору
-                if current_start > 0:
-                    current_start -= 1
-            elif key == b'P':  # Стрілка вниз
-                if current_start < total_logs - MAX_ROWS_ON_SCREEN:
-                    current_start += 1
-            elif key == b'\x49':  # PgUp
-                current_start = max(0, current_start - MAX_ROWS_ON_SCREEN)
-            elif key == b'\x51':  # PgDn
-                current_start = min(total_logs - MAX_ROWS_ON_SCREEN, current_start + MAX_ROWS_ON_SCREEN)
             draw_screen()
 
         # Відновлює курсор
         cursor_info.bVisible = True
         ctypes.windll.kernel32.SetConsoleCursorInfo(handle, ctypes.byref(cursor_info))
 
-    def interactive_unix(stdscr):
-        import curses  # Для перехоплення клавіатури (під Linux/macOS)
+    def interactive_unix():
+        import termios  # Для перехоплення клавіатури (під Linux/macOS)
+        import tty
 
-        global current_start
-        curses.curs_set(0)  # Приховуємо курсор
-        draw_screen(0)
-        while True:
-            key = stdscr.getch()
-            
-            if key == 27:  # Esc
-                break
-            elif key == curses.KEY_UP:
-                if current_start > 0:
-                    current_start -= 1
-            elif key == curses.KEY_DOWN:
-                if current_start < total_logs - MAX_ROWS_ON_SCREEN:
-                    current_start += 1
-            elif key == curses.KEY_PPAGE:
-                current_start = max(0, current_start - MAX_ROWS_ON_SCREEN)
-            elif key == curses.KEY_NPAGE:
-                current_start = min(total_logs - MAX_ROWS_ON_SCREEN, current_start + MAX_ROWS_ON_SCREEN)
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            sys.stdout.write("\033[?25l")  # Приховуємо курсор
             draw_screen()
+            # Де опинився блок після першого виводу — потрібно для прокручування областю терміналу
+            row = query_cursor_row(fd)
+            if row is not None:
+                renderer.top_row = row - (visible_rows + 1)
+            while True:
+                if not handle_key(read_key_unix(fd)):
+                    break
+                draw_screen()
+        finally:
+            sys.stdout.write("\033[?25h")  # Відновлюємо курсор
+            sys.stdout.flush()
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
 
     if os.name == 'nt':
         interactive_win()
     else:
-        curses.wrapper(interactive_unix)
+        interactive_unix()
+    print(f"{COL_GRAY}{renderer.summary()}{COL_RESET}")
 
 # Запуск головного модуля у випадку якщо забув переключитись на нього у VS Code
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ def input_error(func):
     '''
     Декоратор для обробки помилок користувача при взаємодії з функціями.
     Він перехоплює помилки KeyError, ValueError, IndexError і повертає відповідні повідомлення.
-    Також повертає булеве значення, якщо функція завершується успішно, щоб сигналізувати про потребу зберегти зміни.
+    Також повертає результат функції (для змін — ім'я зміненого контакту), щоб сигналізувати про потребу зберегти зміни.
     '''
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -59,6 +59,7 @@ def get_cmd() -> str:
 
 def quit(args=None, contacts=None):
     '''Стандартне завершення роботи'''
+    mdl.close_storage()  # Дописати відкладені зміни на диск і дочекатися фонових операцій
     v.info("До побачення 👋")
     exit(0)
 
@@ -91,7 +92,7 @@ def add_contact(args, contacts):
         return False
     contacts[name] = number
     v.contact_added(name, number)
-    return True
+    return name
 
 @input_error
 def change_contact(args, contacts):
@@ -103,7 +104,7 @@ def change_contact(args, contacts):
         raise KeyError
     contacts[name] = number
     v.contact_changed(name, number)
-    return True
+    return name
 
 @input_error
 def remove_contact(args, contacts:dict):
@@ -115,7 +116,7 @@ def remove_contact(args, contacts:dict):
         raise KeyError
     contacts.pop(name)
     v.contact_deleted(name)
-    return True
+    return name
 
 @input_error
 def show_phone(args, contacts):
@@ -127,6 +128,16 @@ def show_phone(args, contacts):
         raise KeyError
     v.contact_found(name, contacts[name])
 
+@input_error
+def find_contacts(args, contacts):
+    '''Знайти контакти за початком імені або схожим написанням'''
+    if not args:
+        raise IndexError
+    query = " ".join(args)
+    if not mdl.search_ready():
+        v.search_index_building()
+    v.contacts_found(query, mdl.find_contacts(contacts, query), contacts)
+
 def show_all(args=None, contacts=None):
     '''Показати всі контакти'''
     if not contacts:
@@ -155,6 +166,7 @@ COMMANDS = {
     'change': change_contact,
     'remove': remove_contact,
     'phone': show_phone,
+    'find': find_contacts,
     'all': show_all,
     'clr': v.clear_screen,
     '?': help
@@ -164,8 +176,9 @@ def execute(command: str, args: list[str], contacts: dict):
     '''Виконує команду, зберігаючи зміни при необхідності'''
     handler = COMMANDS.get(command)
     if handler:
-        was_changed = handler(args, contacts)
-        if command in ('add', 'change', 'remove') and was_changed:
-            mdl.save_contacts(contacts)
+        changed_name = handler(args, contacts)
+        if command in ('add', 'change', 'remove') and changed_name:
+            # За замовчуванням зміна записується одразу; з model.WRITE_BEHIND — лише позначається для фонового потоку
+            mdl.save_change(contacts, changed_name)
     else:
         unknown_command(command)
@@ -1,20 +1,68 @@
+import atexit
 import csv
-from typing import Dict
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Tuple
 
-# Типова структура контактів
-ContactBook = Dict[str, str]
+from search import FIND_LIMIT, ContactIndex
+
+# Типова структура контактів: словник або будь-яке сховище з тим самим інтерфейсом (ім'я → телефон)
+ContactBook = MutableMapping[str, str]
 
 # Шлях до файлу збереження
 DATA_FILE = "contacts.csv"
 
+# Сховище контактів (див. STORAGE_BACKENDS):
+# "journal" — кожна зміна дописується одним записом у журнал, CSV періодично перебудовується у фоні;
+# "csv"     — після кожної зміни весь CSV-файл перезаписується;
+# "sqlite"  — контакти в базі SQLite, кожна операція — індексований запит, у пам'ять книга не читається.
+STORAGE_MODE = "journal"
+SQLITE_FILE = "contacts.db"
+SQLITE_IMPORT_BATCH = 10_000          # Скільки контактів вставляється одним executemany під час імпорту
+SQLITE_IMPORTED_VERSION = 1           # PRAGMA user_version після імпорту з CSV і журналу
+JOURNAL_FILE = DATA_FILE + ".journal"
+JOURNAL_FSYNC = "always"              # "always" — fsync після кожного запису, "interval" — не частіше за
+JOURNAL_FSYNC_INTERVAL = 1.0          # JOURNAL_FSYNC_INTERVAL секунд, "never" — на розсуд ОС
+# (з WRITE_BEHIND гарантія "always" діє лише для вже збережених пакетів — див. нижче)
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024  # Розмір журналу, після якого запускається ущільнення
+JOURNAL_COMPACT_RETRY = 5.0           # Через скільки секунд (з наступним записом) повторити невдале ущільнення
+
+# Відкладений запис: команди лише позначають контакт зміненим, а фоновий потік зберігає
+# накопичені зміни разом — через WRITE_BEHIND_DELAY секунд після першої з них
+# або щойно їх набереться WRITE_BEHIND_BATCH.
+# Компроміс надійності: команда завершується до запису на диск, тож при збої процесу
+# зміни за останні WRITE_BEHIND_DELAY секунд втрачаються навіть з JOURNAL_FSYNC = "always".
+# Тому за замовчуванням вимкнено — кожна команда зберігається до відповіді користувачу.
+WRITE_BEHIND = False
+WRITE_BEHIND_DELAY = 0.5
+WRITE_BEHIND_BATCH = 256
+
 def load_contacts() -> ContactBook:
     """
-    Завантажити контакти з CSV-файлу.
-    Якщо файл не існує або виникає помилка — повертається порожній словник.
+    Завантажити контакти з вибраного сховища (STORAGE_MODE).
+    Якщо файл не існує або виникає помилка — повертається порожня книга.
+    Для книги в пам'яті індекс для `find` одразу починає будуватися у фоновому потоці;
+    для бази (sqlite) — лише з першим `find`, щоб старт не читав усю таблицю.
+    """
+    global _index
+    contacts = get_storage().load()
+    _index = ContactIndex().start(contacts.keys()) if isinstance(contacts, dict) else None
+    return contacts
+
+def _read_csv(path: str, strict: bool = False) -> ContactBook:
+    """
+    Прочитати CSV-знімок. Помилка читання дає порожній словник,
+    а з `strict` — виняток (щоб ущільнення не перезаписало знімок порожнім).
     """
     contacts: ContactBook = {}
     try:
-        with open(DATA_FILE, mode="r", encoding="utf-8", newline="") as file:
+        with open(path, mode="r", encoding="utf-8", newline="") as file:
             reader = csv.reader(file)
             for row in reader:
                 if len(row) == 2:
@@ -23,6 +71,8 @@ def load_contacts() -> ContactBook:
     except FileNotFoundError:
         return {}
     except Exception:
+        if strict:
+            raise
         return {}
     return contacts
 
@@ -35,6 +85,475 @@ def save_contacts(contacts: ContactBook) -> None:
         for name, phone in contacts.items():
             writer.writerow([name, phone])
 
+def save_change(contacts: ContactBook, name: str) -> None:
+    """
+    Зберегти зміну одного контакту (додавання, зміна або видалення `name`).
+    """
+    get_storage().save_change(contacts, name)
+    if _index is not None:
+        _index.update(name, name in contacts)
+
+def close_storage() -> None:
+    """
+    Завершити роботу зі сховищем: скинути зміни на диск і дочекатися фонових операцій.
+    Викликається з `quit` і ще раз при завершенні інтерпретатора (atexit) — повторний виклик нічого не робить.
+    """
+    global _storage, _index
+    if _index is not None:
+        # Побудова може ще читати імена з бази — зупиняємо її до закриття з'єднання
+        index, _index = _index, None
+        index.cancel()
+    if _storage is not None:
+        storage, _storage = _storage, None
+        storage.close()
+
+class StorageBackend(ABC):
+    """
+    Інтерфейс сховища контактів.
+    `load()` повертає книгу з інтерфейсом словника (ContactBook), з якою працює контролер;
+    після кожної зміни контролер викликає `save_change()` з іменем зміненого контакту.
+    """
+
+    @abstractmethod
+    def load(self) -> ContactBook:
+        ...
+
+    @abstractmethod
+    def save_change(self, contacts: ContactBook, name: str) -> None:
+        ...
+
+    def save_changes(self, contacts: ContactBook, names: Iterable[str]) -> None:
+        """Зберегти кілька змін разом (для відкладеного запису); сховища можуть зробити це за один запис на диск"""
+        for name in names:
+            self.save_change(contacts, name)
+
+    def close(self) -> None:
+        pass
+
+class CsvStorage(StorageBackend):
+    """Уся книга в пам'яті, після кожної зміни CSV-файл перезаписується повністю"""
+
+    def load(self) -> ContactBook:
+        return _read_csv(DATA_FILE)
+
+    def save_change(self, contacts: ContactBook, name: str) -> None:
+        save_contacts(contacts)
+
+    def save_changes(self, contacts: ContactBook, names: Iterable[str]) -> None:
+        # Копія — щоб фоновий запис не перебирав словник, який тим часом змінюється командами
+        save_contacts(dict(contacts))
+
+class ContactJournal(StorageBackend):
+    """
+    Журнал змін поверх CSV-знімка.
+    Кожна зміна — один рядок `<crc32> <json>` у кінці журналу, тож запис коштує O(1), а не O(N).
+    Завантаження: знімок + записи журналу по черзі. Обірваний або пошкоджений останній запис
+    (наприклад, після збою живлення) ігнорується і відрізається від файлу.
+    Коли журнал перевищує `compact_bytes`, він перейменовується на `.old`, а фоновий потік
+    будує з «знімок + .old» новий знімок (атомарна заміна) і лише потім видаляє `.old`.
+    Записи ідемпотентні, тож збій на будь-якому кроці ущільнення не втрачає і не псує дані.
+    Невдале ущільнення повторюється з першим записом після `compact_retry` секунд,
+    а `close()` робить останню спробу у своєму потоці — тож помилка не губиться мовчки.
+    """
+
+    def __init__(self, snapshot_path: str = DATA_FILE, journal_path: str | None = None,
+                 fsync: str = JOURNAL_FSYNC, fsync_interval: float = JOURNAL_FSYNC_INTERVAL,
+                 compact_bytes: int = JOURNAL_COMPACT_BYTES, compact_retry: float = JOURNAL_COMPACT_RETRY):
+        if fsync not in ("always", "interval", "never"):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or snapshot_path + ".journal"
+        self.old_path = self.journal_path + ".old"
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+        self.compact_retry = compact_retry
+        self._file = None
+        self._size = 0
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+        self._compactor: threading.Thread | None = None
+        self._compact_error: Exception | None = None  # Помилка останнього ущільнення
+        self._compact_failed_at = 0.0
+
+    # ---- Читання ----
+
+    @staticmethod
+    def _encode(record: list) -> bytes:
+        payload = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+    @staticmethod
+    def _replay(path: str, contacts: ContactBook) -> int:
+        """
+        Застосувати записи журналу до `contacts`.
+        Повертає довжину коректної частини файлу: все після першого пошкодженого запису відкидається.
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return 0
+        good = 0
+        while good < len(data):
+            end = data.find(b"\n", good)
+            if end == -1:
+                break  # Обірваний останній запис
+            line = data[good:end]
+            try:
+                crc, payload = line.split(b" ", 1)
+                if int(crc, 16) != zlib.crc32(payload):
+                    break
+                op, name, *phone = json.loads(payload)
+            except ValueError:
+                break
+            if op == "put":
+                contacts[name] = phone[0]
+            else:
+                contacts.pop(name, None)
+            good = end + 1
+        return good
+
+    def load(self) -> ContactBook:
+        """Знімок + незавершене ущільнення (.old) + поточний журнал"""
+        contacts = _read_csv(self.snapshot_path)
+        self._replay(self.old_path, contacts)
+        good = self._replay(self.journal_path, contacts)
+        self._open(truncate_to=good)
+        if os.path.exists(self.old_path):
+            self._start_compaction()  # Попереднє ущільнення не встигло завершитися
+        return contacts
+
+    # ---- Запис ----
+
+    def _open(self, truncate_to: int | None = None) -> None:
+        self._file = open(self.journal_path, "ab")
+        if truncate_to is not None and self._file.tell() > truncate_to:
+            self._file.truncate(truncate_to)  # Відрізаємо обірваний хвіст, щоб нові записи йшли після коректних
+            self._sync(force=True)
+        self._size = self._file.seek(0, os.SEEK_END)
+
+    def _sync(self, force: bool = False) -> None:
+        self._file.flush()
+        now = time.monotonic()
+        if force or self.fsync == "always" or (self.fsync == "interval" and now - self._last_sync >= self.fsync_interval):
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def _append(self, *records: list) -> None:
+        """Дописати записи одним write і одним fsync"""
+        with self._lock:
+            if self._file is None:
+                self._open()
+            data = b"".join(self._encode(record) for record in records)
+            self._file.write(data)
+            self._size += len(data)
+            self._sync()
+            if not os.path.exists(self.old_path):
+                if self._size >= self.compact_bytes:
+                    self._rotate()
+            elif self._compact_error is not None and time.monotonic() - self._compact_failed_at >= self.compact_retry:
+                self._start_compaction()  # Попереднє ущільнення не вдалося — `.old` ще не злитий
+
+    def put(self, name: str, phone: str) -> None:
+        self._append(["put", name, phone])
+
+    def delete(self, name: str) -> None:
+        self._append(["del", name])
+
+    @staticmethod
+    def _record(contacts: ContactBook, name: str) -> list:
+        phone = contacts.get(name)  # Один get, а не `in` + `[]`: книгу може змінювати інший потік
+        return ["del", name] if phone is None else ["put", name, phone]
+
+    def save_change(self, contacts: ContactBook, name: str) -> None:
+        self._append(self._record(contacts, name))
+
+    def save_changes(self, contacts: ContactBook, names: Iterable[str]) -> None:
+        records = [self._record(contacts, name) for name in names]
+        if records:
+            self._append(*records)
+
+    # ---- Ущільнення ----
+
+    def _rotate(self) -> None:
+        """Поточний журнал стає `.old` для фонового ущільнення, нові записи йдуть у свіжий журнал"""
+        self._sync(force=True)
+        self._file.close()
+        os.replace(self.journal_path, self.old_path)
+        self._open()
+        self._start_compaction()
+
+    def _start_compaction(self) -> None:
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact, name="contacts-compaction")
+        self._compactor.start()
+
+    def _compact(self) -> None:
+        """Фонове ущільнення: помилка не завершує потік мовчки, а запам'ятовується для повтору"""
+        try:
+            self._merge_old()
+        except Exception as e:
+            self._compact_error, self._compact_failed_at = e, time.monotonic()
+        else:
+            self._compact_error = None
+
+    def _merge_old(self) -> None:
+        contacts = _read_csv(self.snapshot_path, strict=True)
+        self._replay(self.old_path, contacts)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, mode="w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            for name, phone in contacts.items():
+                writer.writerow([name, phone])
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)  # Атомарна заміна знімка
+        os.remove(self.old_path)
+
+    def close(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+        try:
+            if self._compact_error is not None:
+                self._merge_old()  # Остання спроба; якщо й вона невдала — виняток отримає той, хто закриває
+                self._compact_error = None
+        finally:
+            with self._lock:
+                if self._file is not None:
+                    self._sync(force=True)
+                    self._file.close()
+                    self._file = None
+
+class SqliteContactBook(MutableMapping):
+    """
+    Книга контактів у таблиці SQLite з інтерфейсом словника.
+    Кожна операція — окремий запит за первинним ключем (індекс), тож пам'ять і час старту
+    не залежать від кількості контактів. Тексти запитів сталі: sqlite3 кешує підготовлені
+    інструкції для з'єднання й не розбирає SQL повторно.
+    Зміни потрапляють у поточну транзакцію; фіксує її `commit()` (його викликає SqliteStorage.save_change).
+    Запис і фіксація виконуються під `lock`, тож commit можна викликати з потоку відкладеного запису.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._db = connection
+        self.lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> str:
+        row = self._db.execute("SELECT phone FROM contacts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def __setitem__(self, name: str, phone: str) -> None:
+        with self.lock:
+            self._db.execute("INSERT OR REPLACE INTO contacts (name, phone) VALUES (?, ?)", (name, phone))
+
+    def __delitem__(self, name: str) -> None:
+        with self.lock:
+            if self._db.execute("DELETE FROM contacts WHERE name = ?", (name,)).rowcount == 0:
+                raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return self._db.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, in self._db.execute("SELECT name FROM contacts ORDER BY name"))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        # Перевірка на порожність без підрахунку всіх рядків
+        return self._db.execute("SELECT 1 FROM contacts LIMIT 1").fetchone() is not None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Усі пари (ім'я, телефон) одним запитом, упорядковані за іменем"""
+        return iter(self._db.execute("SELECT name, phone FROM contacts ORDER BY name"))
+
+    def update(self, other: Iterable[Tuple[str, str]] | dict = (), **kwargs) -> None:
+        """Пакетна вставка одним executemany в межах поточної транзакції"""
+        pairs = other.items() if hasattr(other, "items") else other
+        with self.lock:
+            self._db.executemany("INSERT OR REPLACE INTO contacts (name, phone) VALUES (?, ?)", pairs)
+            if kwargs:
+                self._db.executemany("INSERT OR REPLACE INTO contacts (name, phone) VALUES (?, ?)", kwargs.items())
+
+    def commit(self) -> None:
+        with self.lock:
+            self._db.commit()
+
+class SqliteStorage(StorageBackend):
+    """
+    Сховище в базі SQLite (WAL). Під час першого відкриття наявні контакти з CSV і журналу
+    імпортуються пакетами по SQLITE_IMPORT_BATCH в одній транзакції. Що імпорт виконано, позначає
+    `PRAGMA user_version` (у тій самій транзакції), тож база, з якої видалили всі контакти,
+    не наповнюється з CSV повторно.
+    """
+
+    def __init__(self, path: str = SQLITE_FILE):
+        self.path = path
+        self._db: sqlite3.Connection | None = None
+        self._book: SqliteContactBook | None = None
+
+    def load(self) -> ContactBook:
+        # Зміни фіксуються й з потоку відкладеного запису; доступ на запис серіалізує SqliteContactBook.lock
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS contacts (name TEXT PRIMARY KEY, phone TEXT NOT NULL) WITHOUT ROWID")
+        self._book = book = SqliteContactBook(self._db)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < SQLITE_IMPORTED_VERSION:
+            # База, створена до появи позначки, але вже з контактами, вважається імпортованою
+            if not book:
+                self._import(book)
+            with book.lock:
+                self._db.execute(f"PRAGMA user_version = {SQLITE_IMPORTED_VERSION}")
+                self._db.commit()
+        return book
+
+    def _import(self, book: SqliteContactBook) -> None:
+        """Перенести в порожню базу контакти з CSV-знімка та журналу (якщо вони є)"""
+        contacts = _read_csv(DATA_FILE)
+        for path in (JOURNAL_FILE + ".old", JOURNAL_FILE):
+            ContactJournal._replay(path, contacts)
+        items = list(contacts.items())
+        for start in range(0, len(items), SQLITE_IMPORT_BATCH):
+            book.update(items[start:start + SQLITE_IMPORT_BATCH])
+        book.commit()
+
+    def save_change(self, contacts: ContactBook, name: str) -> None:
+        self._book.commit()  # Зміна вже в базі — фіксуємо транзакцію
+
+    def save_changes(self, contacts: ContactBook, names: Iterable[str]) -> None:
+        self._book.commit()  # Усі накопичені зміни — одна транзакція
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._book.commit()
+            self._db.close()
+            self._db = None
+
+class WriteBehind(StorageBackend):
+    """
+    Відкладений запис поверх іншого сховища.
+    `save_change` лише додає ім'я до множини змінених і одразу повертається, тож час команди
+    не залежить від швидкості диска. Фоновий потік зберігає накопичене одним `save_changes`
+    через `delay` секунд після першої зміни або щойно змінених імен набереться `batch`.
+    Кілька змін одного контакту зливаються в одну: зберігається його стан на момент запису.
+    Якщо збереження не вдалося, імена повертаються в чергу, а `close()` (при виході) повторює
+    його вже у своєму потоці — тож помилка не губиться мовчки.
+    """
+
+    def __init__(self, backend: StorageBackend, delay: float = WRITE_BEHIND_DELAY, batch: int = WRITE_BEHIND_BATCH):
+        self.backend = backend
+        self.delay = delay
+        self.batch = batch
+        self._contacts: ContactBook | None = None
+        self._dirty: Dict[str, None] = {}  # Упорядкована множина змінених імен
+        self._changed = threading.Condition()
+        self._closing = False
+        self._writer: threading.Thread | None = None
+
+    def load(self) -> ContactBook:
+        self._contacts = self.backend.load()
+        # Потік-демон не тримає інтерпретатор; дописування при виході гарантує close() через atexit
+        self._writer = threading.Thread(target=self._run, name="contacts-writer", daemon=True)
+        self._writer.start()
+        return self._contacts
+
+    def save_change(self, contacts: ContactBook, name: str) -> None:
+        with self._changed:
+            self._dirty[name] = None
+            self._changed.notify()
+
+    def _take(self) -> List[str] | None:
+        """Дочекатися пакета змін; None — потік завершується"""
+        with self._changed:
+            while not self._dirty and not self._closing:
+                self._changed.wait()
+            deadline = time.monotonic() + self.delay
+            while not self._closing and len(self._dirty) < self.batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            if self._closing:
+                return None  # Решту дописує close()
+            names = list(self._dirty)
+            self._dirty.clear()
+            return names
+
+    def _run(self) -> None:
+        while (names := self._take()) is not None:
+            try:
+                self.backend.save_changes(self._contacts, names)
+            except Exception:
+                with self._changed:
+                    # Новіші зміни лишаються в кінці черги; повтор — з наступним пакетом або в close()
+                    self._dirty = dict.fromkeys(names) | self._dirty
+
+    def flush(self) -> None:
+        """Зберегти всі накопичені зміни в поточному потоці"""
+        with self._changed:
+            names = list(self._dirty)
+            self._dirty.clear()
+        if names:
+            self.backend.save_changes(self._contacts, names)
+
+    def close(self) -> None:
+        with self._changed:
+            self._closing = True
+            self._changed.notify()
+        if self._writer is not None:
+            self._writer.join()  # Дочекатися пакета, який зберігається саме зараз
+            self._writer = None
+        try:
+            self.flush()
+        finally:
+            self.backend.close()
+
+def _journal_storage() -> ContactJournal:
+    return ContactJournal(DATA_FILE, JOURNAL_FILE, JOURNAL_FSYNC, JOURNAL_FSYNC_INTERVAL, JOURNAL_COMPACT_BYTES,
+                          JOURNAL_COMPACT_RETRY)
+
+STORAGE_BACKENDS = {
+    "csv": CsvStorage,
+    "journal": _journal_storage,
+    "sqlite": lambda: SqliteStorage(SQLITE_FILE),
+}
+
+_storage: StorageBackend | None = None
+
+def get_storage() -> StorageBackend:
+    """Сховище для STORAGE_MODE (створюється при першому зверненні)"""
+    global _storage
+    if _storage is None:
+        if STORAGE_MODE not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage mode: {STORAGE_MODE}")
+        _storage = STORAGE_BACKENDS[STORAGE_MODE]()
+        if WRITE_BEHIND:
+            _storage = WriteBehind(_storage, WRITE_BEHIND_DELAY, WRITE_BEHIND_BATCH)
+        atexit.register(close_storage)  # Дописати зміни, навіть якщо програма завершилася не через quit
+    return _storage
+
+_index: ContactIndex | None = None
+
+def search_ready() -> bool:
+    """Чи вже побудований індекс для `find` (інакше пошук дочекається побудови)"""
+    return _index is not None and _index.ready
+
+def find_contacts(contacts: ContactBook, query: str, limit: int = FIND_LIMIT) -> List[str]:
+    """
+    Знайти імена контактів за префіксом або зі схожим написанням.
+    Індекс будується в load_contacts (або тут, якщо книгу завантажено інакше) і далі оновлюється в save_change.
+    """
+    global _index
+    if _index is None:
+        _index = ContactIndex().start(contacts.keys())
+    return _index.find(query, limit)
+
 def add_contact(contacts: ContactBook, name: str, phone: str) -> None:
     """
     Додати новий контакт або перезаписати існуючий.
@@ -0,0 +1,282 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+FIND_LIMIT = 10          # Скільки результатів повертає пошук за замовчуванням
+FUZZY_MIN_QUERY = 3      # Коротші запити шукаються лише за префіксом
+
+Bucket = List[Tuple[str, str]]  # Відсортовані пари (ключ, ім'я)
+_DICT_KEYS = type({}.keys())
+
+def _key(name: str) -> str:
+    return name.casefold()
+
+def _max_edits(query: str) -> int:
+    return 1 if len(query) <= 5 else 2
+
+def _step(query: str, row: List[int], char: str, depth: int, edits: int) -> List[int]:
+    '''
+    Рядок таблиці Левенштейна після додавання `char` до префікса імені довжини `depth`:
+    row[j] — відстань між query[:j] і префіксом. Рахується лише смуга |j - depth| <= edits,
+    решта клітинок (і все, що більше за `edits`) — просто edits + 1.
+    '''
+    over = edits + 1
+    current = [over] * len(row)
+    if depth <= edits:
+        current[0] = depth
+    for j in range(max(1, depth - edits), min(len(query), depth + edits) + 1):
+        current[j] = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + (query[j - 1] != char), over)
+    return current
+
+def _after(prefix: str) -> str:
+    '''Найменший рядок, більший за всі рядки з префіксом `prefix`'''
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+class ContactIndex:
+    '''
+    Індекс імен контактів для команди `find`.
+    Неглибокий trie: два рівні вузлів за першими двома символами, під ними — відсортовані
+    списки імен (bisect), тож і вставка, і пошук за префіксом не проходять усю книгу.
+    Нечіткий пошук з однією правкою — перебір варіантів запиту, кожен з яких є діапазоном
+    відсортованого списку (`_near`). Дві правки — обхід того самого trie з рядком таблиці
+    Левенштейна на кожен вузол (нижче другого рівня вузли — діапазони відсортованого списку
+    з однаковим префіксом). Гілка відкидається, щойно відстань до будь-якого префікса запиту
+    перевищує k, тож переглядаються лише близькі до запиту вузли, а знайдено буде кожне
+    ім'я в межах k правок.
+    Будується у фоновому потоці (`start`); зміни, що надійшли під час побудови,
+    застосовуються після неї. `cancel` зупиняє побудову (наприклад, перед закриттям бази,
+    з якої читаються імена) — такий індекс лишається неготовим.
+    '''
+
+    def __init__(self):
+        self._trie: Dict[str, Dict[str, Bucket]] = {}
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, bool]] | None = None  # Зміни під час побудови
+        self._thread: threading.Thread | None = None
+        self._cancelled = threading.Event()
+
+    def start(self, names: Iterable[str]) -> "ContactIndex":
+        self._pending = []
+        self._thread = threading.Thread(target=self._build, args=(names,), name="contacts-index", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self._pending is None
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    def cancel(self) -> None:
+        '''Перервати побудову і дочекатися завершення потоку'''
+        self._cancelled.set()
+        self.wait()
+
+    def _build(self, names: Iterable[str]) -> None:
+        trie: Dict[str, Dict[str, Bucket]] = {}
+        # Для словника list() знімає копію ключів одним викликом, поки інший потік його не змінює;
+        # інші джерела (курсор бази) читаються по черзі, щоб побудову можна було перервати
+        source = list(names) if isinstance(names, _DICT_KEYS) else names
+        try:
+            for name in source:
+                if self._cancelled.is_set():
+                    return
+                key = _key(name)
+                trie.setdefault(key[:1], {}).setdefault(key[1:2], []).append((key, name))
+            for level in trie.values():
+                for bucket in level.values():
+                    bucket.sort()
+        finally:
+            if not self._cancelled.is_set():
+                self._publish(trie)
+
+    def _publish(self, trie: Dict[str, Dict[str, Bucket]]) -> None:
+        with self._lock:
+            self._trie = trie
+            # Ім'я могло потрапити в знімок і вже після цього змінитися — повторюємо зміни
+            for name, present in self._pending:
+                self._apply(name, present)
+            self._pending = None
+
+    # ---- Оновлення ----
+
+    def _apply(self, name: str, present: bool) -> None:
+        key = _key(name)
+        bucket = self._trie.setdefault(key[:1], {}).setdefault(key[1:2], [])
+        i = bisect_left(bucket, (key, name))
+        exists = i < len(bucket) and bucket[i] == (key, name)
+        if present and not exists:
+            bucket.insert(i, (key, name))
+        elif not present and exists:
+            del bucket[i]
+
+    def update(self, name: str, present: bool) -> None:
+        '''Синхронізувати індекс зі станом контакту після зміни (додавання, зміни номера, видалення)'''
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((name, present))
+            else:
+                self._apply(name, present)
+
+    # ---- Пошук ----
+
+    def _levels(self, level: Dict[str, Bucket]) -> List[Bucket]:
+        return [level[c] for c in sorted(level)]
+
+    def _prefix(self, key: str, exclude: set, found: List[str], limit: int) -> None:
+        '''Імена з префіксом `key` в алфавітному порядку'''
+        first = self._trie.get(key[:1], {})
+        buckets = [first.get(key[1:2], [])] if len(key) > 1 else self._levels(first)
+        for bucket in buckets:
+            self._collect(bucket, bisect_left(bucket, (key,)), len(bucket), key, exclude, found, limit)
+
+    @staticmethod
+    def _collect(bucket: Bucket, lo: int, hi: int, key: str, exclude: set, found: List[str], limit: int) -> None:
+        for i in range(lo, hi):
+            entry_key, name = bucket[i]
+            if len(found) >= limit or not entry_key.startswith(key):
+                return
+            if name not in exclude:
+                exclude.add(name)
+                found.append(name)
+
+    def _bucket(self, prefix: str) -> Bucket:
+        return self._trie.get(prefix[:1], {}).get(prefix[1:2], [])
+
+    @staticmethod
+    def _span(bucket: Bucket, prefix: str, lo: int, hi: int) -> Tuple[int, int]:
+        '''Діапазон імен з префіксом `prefix` у bucket[lo:hi]; для порожнього — другий bisect не потрібен'''
+        lo = bisect_left(bucket, (prefix,), lo, hi)
+        if lo == hi or not bucket[lo][0].startswith(prefix):
+            return lo, lo
+        return lo, bisect_left(bucket, (_after(prefix),), lo, hi)
+
+    def _variant(self, variant: str, bucket: Bucket | None = None, lo: int = 0, hi: int = 0) -> Tuple[Bucket, int, int]:
+        '''Діапазон імен з префіксом `variant` — у межах bucket[lo:hi], якщо його вже відомо'''
+        if bucket is None:
+            bucket = self._bucket(variant)
+            hi = len(bucket)
+        return (bucket, *self._span(bucket, variant, lo, hi))
+
+    def _children(self, prefix: str) -> List[Tuple[str, Bucket | None, int, int]]:
+        '''
+        Символи, що йдуть одразу після `prefix` в іменах, з діапазоном імен для кожного.
+        Для порожнього префікса діапазону немає (None): список визначають перші два символи.
+        '''
+        if not prefix:
+            return [(c, None, 0, 0) for c in self._trie if c]
+        if len(prefix) == 1:
+            level = self._trie.get(prefix, {})
+            return [(c, level[c], 0, len(level[c])) for c in level if c]
+        bucket = self._bucket(prefix)
+        lo, hi = self._span(bucket, prefix, 0, len(bucket))
+        children = []
+        depth = len(prefix)
+        while lo < hi:
+            entry_key = bucket[lo][0]
+            if len(entry_key) == depth:
+                lo += 1  # Ім'я закінчується на самому префіксі
+                continue
+            end = bisect_left(bucket, (_after(entry_key[:depth + 1]),), lo, hi)
+            children.append((entry_key[depth], bucket, lo, end))
+            lo = end
+        return children
+
+    def _near(self, key: str, exclude: set, found: List[str], limit: int) -> None:
+        '''
+        Імена, префікс яких відрізняється від `key` рівно на одну правку, за алфавітом.
+        Замість обходу trie перебираються варіанти запиту з однією правкою: видалення кожного
+        символу, заміна і вставка — лише символами, що справді йдуть у trie після спільного
+        початку, і лише в діапазоні імен з таким початком. Кожен варіант — один bisect,
+        а з непорожніх діапазонів (упорядкованих за першим іменем) беруться перші `limit` імен.
+        '''
+        want = limit - len(found)
+        if want <= 0:
+            return
+        ranges = [self._variant(key[:i] + key[i + 1:]) for i in range(len(key))]
+        for i in range(len(key)):
+            head = key[:i]
+            for char, bucket, lo, hi in self._children(head):
+                if char != key[i]:
+                    ranges.append(self._variant(head + char + key[i + 1:], bucket, lo, hi))
+                # Вставка в кінці запиту дала б префіксний збіг — її немає серед i < len(key)
+                ranges.append(self._variant(head + char + key[i:], bucket, lo, hi))
+        ranges = [r for r in ranges if r[1] < r[2]]
+        ranges.sort(key=lambda r: r[0][r[1]])
+        best: Bucket = []
+        for bucket, lo, hi in ranges:
+            if len(best) >= want and bucket[lo] >= best[-1]:
+                break  # Решта діапазонів починається з імен, що не потрапляють у перші `want`
+            for i in range(lo, hi):
+                entry = bucket[i]
+                if len(best) >= want and entry >= best[-1]:
+                    break
+                if entry[1] not in exclude and entry not in best:
+                    insort(best, entry)
+                    del best[want:]
+        for _, name in best:
+            exclude.add(name)
+            found.append(name)
+
+    def _fuzzy(self, key: str, edits: int, exclude: set, found: List[str], limit: int) -> None:
+        '''Імена, префікс яких відрізняється від `key` не більш ніж на `edits` правок'''
+        root = [min(j, edits + 1) for j in range(len(key) + 1)]
+        for c1 in sorted(self._trie):
+            row1 = _step(key, root, c1, 1, edits)
+            if min(row1) > edits:
+                continue
+            level = self._trie[c1]
+            if row1[-1] <= edits:
+                for bucket in self._levels(level):
+                    self._collect(bucket, 0, len(bucket), "", exclude, found, limit)
+                continue
+            for c2 in sorted(level):
+                if len(found) >= limit:
+                    return
+                bucket = level[c2]
+                if not c2:
+                    continue  # Однолітерне ім'я закінчується на вузлі c1, який не підійшов
+                row2 = _step(key, row1, c2, 2, edits)
+                if min(row2) <= edits:
+                    self._walk(key, edits, bucket, 0, len(bucket), 2, row2, exclude, found, limit)
+
+    def _walk(self, key: str, edits: int, bucket: Bucket, lo: int, hi: int, depth: int, row: List[int],
+              exclude: set, found: List[str], limit: int) -> None:
+        '''Вузол trie — діапазон bucket[lo:hi] зі спільним префіксом довжини `depth`'''
+        if row[-1] <= edits:
+            # Увесь запит уже в межах правок — підходить кожне ім'я під цим вузлом
+            self._collect(bucket, lo, hi, "", exclude, found, limit)
+            return
+        while lo < hi and len(bucket[lo][0]) == depth:
+            lo += 1  # Імена, що закінчуються на цьому вузлі, не підійшли
+        while lo < hi and len(found) < limit:
+            prefix = bucket[lo][0][:depth + 1]
+            end = bisect_left(bucket, (_after(prefix),), lo, hi)
+            child = _step(key, row, prefix[-1], depth + 1, edits)
+            if min(child) <= edits:
+                self._walk(key, edits, bucket, lo, end, depth + 1, child, exclude, found, limit)
+            lo = end
+
+    def find(self, query: str, limit: int = FIND_LIMIT) -> List[str]:
+        '''
+        Спершу імена з префіксом `query` (без урахування регістру, за алфавітом),
+        потім — схожі імена з 1, далі з 2 помилками в запиті (у межах кожної групи — за алфавітом).
+        Не більше `limit` результатів; до завершення побудови індексу чекає на неї.
+        '''
+        key = _key(query.strip())
+        if not key or limit <= 0:
+            return []
+        self.wait()
+        found: List[str] = []
+        exclude: set = set()
+        with self._lock:
+            self._prefix(key, exclude, found, limit)
+            if len(key) >= FUZZY_MIN_QUERY:
+                # Спершу найближчі: імена з однією правкою, потім (для довших запитів) — з двома
+                if len(found) < limit:
+                    self._near(key, exclude, found, limit)
+                if _max_edits(key) > 1 and len(found) < limit:
+                    self._fuzzy(key, 2, exclude, found, limit)
+        return found
@@ -142,12 +142,24 @@ def show_all_contacts(contacts: dict):
     if not contacts:
         contacts_not_found()
         return
-    keys = sorted(contacts.keys())
-    prn(f"Кількість осіб в контактах: {view(str(len(keys)), '*3')}")
-    for name in keys:
-        number = contacts[name]
+    items = sorted(contacts.items())  # Пари одним проходом, без окремого пошуку номера для кожного імені
+    prn(f"Кількість осіб в контактах: {view(str(len(items)), '*3')}")
+    for name, number in items:
         prn(f' > {person(name)} - {phone(number)}')
 
+def contacts_found(query: str, names: list[str], contacts: dict):
+    '''Виводить результати пошуку: ім'я + номер'''
+    if not names:
+        warn(f"За запитом '{person(query)}' нічого не знайдено.")
+        return
+    prn(f"Знайдено за запитом '{person(query)}': {view(str(len(names)), '*3')}")
+    for name in names:
+        prn(f' > {person(name)} - {phone(contacts[name])}')
+
+def search_index_building():
+    '''Повідомлення, що пошук чекає на побудову індексу'''
+    info("Індекс пошуку ще будується після запуску, зачекайте...")
+
 def show_help():
     '''Виводить список доступних команд з коротким описом'''
     prn(view(' Ось перелік команд: ', '*0h'))
@@ -176,6 +188,10 @@ def show_help():
     s = f"{higlight_cmd('phone')} {person('<name>')}         "
     prn(f"{s} - відобразити номер особи зі списку контактів. Також запис має існувати в списку контактів.")
 
+    # find
+    s = f"{higlight_cmd('find')} {person('<query>')}         "
+    prn(f"{s} - знайти контакти за початком імені або схожим написанням (навіть з помилками).")
+
     # all
     s = f"{higlight_cmd('all')}                  "
     prn(f"{s} - відобразити всі записи осіб зі списку контактів разом з номерами.")